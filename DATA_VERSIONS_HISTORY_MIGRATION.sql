@@ -0,0 +1,43 @@
+-- Migracao: historico de versoes com snapshots completos + deltas
+-- Versoes 'full' guardam o dataset inteiro em data; versoes 'delta' guardam
+-- apenas {inseridos, atualizados, removidos[, ordem]} em relacao a versao anterior.
+-- Usado por dados/scripts/versionamento_dados.py (ArmazenamentoPostgres).
+--
+-- Tabela propria, separada de data_versions: utils/googleSheetsSync.ts le
+-- data_versions.data como o array de linhas e compara file_hash com o seu
+-- proprio hash, entao deltas naquela serie quebrariam a sincronizacao.
+
+-- 1) Tabela do historico
+CREATE TABLE IF NOT EXISTS public.data_versions_history (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+    empresa VARCHAR NOT NULL,
+    file_name VARCHAR NOT NULL,
+    file_hash VARCHAR NOT NULL,
+    data_type VARCHAR NOT NULL,
+    file_size INT,
+    row_count INT,
+    version_number INT NOT NULL,
+    storage_kind VARCHAR NOT NULL DEFAULT 'full' CHECK (storage_kind IN ('full', 'delta')),
+    data JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW(),
+
+    UNIQUE(user_id, empresa, file_name, version_number)
+);
+
+-- 2) Indice para localizar o checkpoint mais proximo de uma versao
+CREATE INDEX IF NOT EXISTS idx_data_versions_history_file_version
+  ON public.data_versions_history(user_id, empresa, file_name, version_number DESC);
+
+-- 3) Seguranca: mesmas regras de data_versions
+ALTER TABLE public.data_versions_history ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view their own data versions history" ON public.data_versions_history;
+CREATE POLICY "Users can view their own data versions history"
+    ON public.data_versions_history FOR SELECT
+    USING (auth.uid() = user_id);
+
+DROP POLICY IF EXISTS "Users can create data versions history" ON public.data_versions_history;
+CREATE POLICY "Users can create data versions history"
+    ON public.data_versions_history FOR INSERT
+    WITH CHECK (auth.uid() = user_id);
@@ -0,0 +1,117 @@
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from caminhos import DADOS_DIR
+from mesclar_dados import gravar_json_atomico
+from particionar_dados import chave_particao
+
+CAMPOS_SERIE = ('empresa', 'categoria')
+
+
+class AcumuladoMensal:
+    """Somas acumuladas por série (empresa x categoria) ao longo dos meses.
+
+    Montado uma vez por dataset; qualquer total de intervalo de meses sai de
+    duas leituras do acumulado (acumulado[fim] - acumulado[inicio]), então YTD,
+    trimestres, móvel 12 meses e comparações custam O(1) por célula, sem somar
+    os meses de novo para cada janela.
+    """
+
+    def __init__(self, matriz):
+        self.series = matriz.index
+        self.meses = matriz.columns
+        valores = matriz.to_numpy(dtype=float)
+        self._acumulado = np.zeros((valores.shape[0], valores.shape[1] + 1))
+        np.cumsum(valores, axis=1, out=self._acumulado[:, 1:])
+
+    @classmethod
+    def de_registros(cls, registros, campos_serie=CAMPOS_SERIE, campo_valor='valor', ano_padrao=None):
+        """Monta a matriz séries x meses a partir dos registros de um dataset"""
+        linhas = []
+        for registro in registros:
+            _, ano, mes = chave_particao(registro)
+            if not ano:
+                if ano_padrao is None:
+                    raise ValueError("Registros sem ano; informe ano_padrao")
+                ano = ano_padrao
+            linhas.append((*(str(registro.get(c, '')) for c in campos_serie),
+                           pd.Period(year=ano, month=mes, freq='M'), float(registro.get(campo_valor) or 0)))
+
+        df = pd.DataFrame(linhas, columns=[*campos_serie, 'periodo', 'valor'])
+        matriz = df.pivot_table(index=list(campos_serie), columns='periodo', values='valor',
+                                aggfunc='sum', fill_value=0.0)
+        meses = pd.period_range(matriz.columns.min(), matriz.columns.max(), freq='M')
+        return cls(matriz.reindex(columns=meses, fill_value=0.0))
+
+    def _limites(self, inicios, fins):
+        """Posições no acumulado para intervalos fechados [inicio, fim]; fora da faixa soma zero"""
+        primeiro = self.meses[0].ordinal
+        total = len(self.meses)
+        ini = np.clip(np.asarray([p.ordinal for p in inicios]) - primeiro, 0, total)
+        fim = np.clip(np.asarray([p.ordinal for p in fins]) - primeiro + 1, 0, total)
+        return ini, np.maximum(fim, ini)
+
+    def totais(self, janelas):
+        """Tabela séries x janelas; 'janelas' é um dict nome -> (mês inicial, mês final)"""
+        nomes = list(janelas)
+        inicios = [pd.Period(janelas[n][0], freq='M') for n in nomes]
+        fins = [pd.Period(janelas[n][1], freq='M') for n in nomes]
+        ini, fim = self._limites(inicios, fins)
+        valores = self._acumulado[:, fim] - self._acumulado[:, ini]
+        return pd.DataFrame(valores, index=self.series, columns=nomes)
+
+    def janelas_padrao(self, mes):
+        """Mês, trimestre, YTD e móvel 12 meses terminando em 'mes', e as mesmas janelas um ano antes"""
+        mes = pd.Period(mes, freq='M')
+        janelas = {}
+        for sufixo, ref in (('', mes), ('_anterior', mes - 12)):
+            inicio_trimestre = pd.Period(year=ref.year, month=3 * ((ref.month - 1) // 3) + 1, freq='M')
+            janelas[f'mes{sufixo}'] = (ref, ref)
+            janelas[f'trimestre{sufixo}'] = (inicio_trimestre, ref)
+            janelas[f'ytd{sufixo}'] = (pd.Period(year=ref.year, month=1, freq='M'), ref)
+            janelas[f'movel_12{sufixo}'] = (ref - 11, ref)
+        return janelas
+
+    def comparativo(self, mes=None):
+        """Totais das janelas padrão com variação absoluta e percentual contra o ano anterior"""
+        mes = self.meses[-1] if mes is None else pd.Period(mes, freq='M')
+        tabela = self.totais(self.janelas_padrao(mes))
+        for janela in ('mes', 'trimestre', 'ytd', 'movel_12'):
+            anterior = tabela[f'{janela}_anterior']
+            tabela[f'{janela}_delta'] = tabela[janela] - anterior
+            tabela[f'{janela}_delta_pct'] = (tabela[f'{janela}_delta'] / anterior.replace(0, np.nan) * 100)
+        return tabela.round(2)
+
+
+def tabela_para_registros(tabela):
+    """Converte a tabela em lista de dicts (séries como colunas), pronta para as views"""
+    return json.loads(tabela.reset_index().to_json(orient='records', force_ascii=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Totais por período (mês, trimestre, YTD, móvel 12m)')
+    parser.add_argument('dataset', nargs='?', default='despesas', help='Arquivo em dados/ sem .json')
+    parser.add_argument('--mes', help='Mês de referência (AAAA-MM); padrão: último mês do dataset')
+    parser.add_argument('--campo', default='valor', help='Campo de valor somado (ex.: realizado)')
+    parser.add_argument('--ano-padrao', type=int, help='Ano para registros sem data (ex.: orcamento)')
+    parser.add_argument('--saida', help='Grava o comparativo em JSON neste caminho')
+    args = parser.parse_args()
+
+    with open(DADOS_DIR / f'{args.dataset}.json', 'r', encoding='utf-8') as f:
+        registros = json.load(f)
+
+    acumulado = AcumuladoMensal.de_registros(registros, campo_valor=args.campo, ano_padrao=args.ano_padrao)
+    tabela = acumulado.comparativo(args.mes)
+
+    if args.saida:
+        gravar_json_atomico(args.saida, tabela_para_registros(tabela))
+        print(f"✅ Comparativo salvo em: {args.saida}")
+    else:
+        print(tabela[['mes', 'trimestre', 'ytd', 'movel_12', 'ytd_delta_pct']].to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,8 @@
 import pandas as pd
 
-file_path = 'dados/excel_exemplos/analise_despesas_exemplo.xlsx'
+from caminhos import EXCEL_DIR
+
+file_path = EXCEL_DIR / 'analise_despesas_exemplo.xlsx'
 df = pd.read_excel(file_path, sheet_name=0)
 
 print('=== ESTRUTURA DO ARQUIVO ===')
@@ -1,6 +1,8 @@
 import openpyxl
 
-file_path = 'dados/excel_exemplos/analise_despesas_exemplo.xlsx'
+from caminhos import EXCEL_DIR
+
+file_path = EXCEL_DIR / 'analise_despesas_exemplo.xlsx'
 wb = openpyxl.load_workbook(file_path)
 
 print('=== ABAS DO ARQUIVO ===')
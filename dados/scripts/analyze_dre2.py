@@ -1,6 +1,8 @@
 import openpyxl
 
-file_path = 'dados/excel_exemplos/Dashboard_Financeiro_Exemplo.xlsx'
+from caminhos import EXCEL_DIR
+
+file_path = EXCEL_DIR / 'Dashboard_Financeiro_Exemplo.xlsx'
 wb = openpyxl.load_workbook(file_path)
 
 for sheet_name in wb.sheetnames:
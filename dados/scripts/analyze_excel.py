@@ -1,8 +1,10 @@
 import pandas as pd
 import json
 
+from caminhos import EXCEL_DIR, RAIZ_DIR
+
 # Ler o arquivo Excel
-df = pd.read_excel('exemplo_aba_despesas.xlsx')
+df = pd.read_excel(EXCEL_DIR / 'exemplo_aba_despesas.xlsx')
 
 print("=" * 80)
 print("ANÁLISE DO ARQUIVO: exemplo_aba_despesas.xlsx")
@@ -29,8 +31,8 @@ for col in df.columns:
 
 print("\n\n💾 SALVANDO AMOSTRA EM JSON...")
 sample = df.head(20).to_dict(orient='records')
-with open('exemplo_despesas_sample.json', 'w', encoding='utf-8') as f:
+with open(RAIZ_DIR / 'exemplo_despesas_sample.json', 'w', encoding='utf-8') as f:
     json.dump(sample, f, indent=2, ensure_ascii=False, default=str)
-print("✅ Amostra salva em: exemplo_despesas_sample.json")
+print(f"✅ Amostra salva em: {RAIZ_DIR / 'exemplo_despesas_sample.json'}")
 
 print("\n" + "=" * 80)
@@ -0,0 +1,102 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from caminhos import DADOS_DIR
+from particionar_dados import chave_particao
+
+GRUPO = ['empresa', 'subcategoria', 'fornecedor']
+LIMIAR_PADRAO = 3.5
+JANELA_PADRAO = 6
+MIN_OBSERVACOES = 4
+
+
+def despesas_para_dataframe(registros):
+    """DataFrame das despesas com ano/mes normalizados e ordenado no tempo"""
+    df = pd.DataFrame(registros)
+    chaves = [chave_particao(r) for r in registros]
+    df['ano'] = [ano for _, ano, _ in chaves]
+    df['mes'] = [mes for _, _, mes in chaves]
+    df['valor'] = pd.to_numeric(df['valor'], errors='coerce').fillna(0.0)
+    for coluna in GRUPO:
+        if coluna not in df:
+            df[coluna] = ''
+        df[coluna] = df[coluna].fillna('').astype('category')
+    return df.sort_values(['ano', 'mes'], kind='stable').reset_index(drop=True)
+
+
+def pontuar_mad(df):
+    """Z-score robusto por grupo: 0.6745 * (valor - mediana) / MAD"""
+    grupos = df.groupby(GRUPO, observed=True)['valor']
+    mediana = grupos.transform('median')
+    desvio = (df['valor'] - mediana).abs()
+    mad = desvio.groupby([df[c] for c in GRUPO], observed=True).transform('median')
+    tamanho = grupos.transform('size')
+
+    score = 0.6745 * (df['valor'] - mediana) / mad.replace(0, np.nan)
+    score[tamanho < MIN_OBSERVACOES] = np.nan
+    return score, mediana
+
+
+def pontuar_janela(df, janela=JANELA_PADRAO):
+    """Z-score contra a média/desvio móveis dos lançamentos anteriores do grupo"""
+    grupos = df.groupby(GRUPO, observed=True, sort=False)['valor']
+    anteriores = grupos.shift(1)
+    movel = anteriores.groupby([df[c] for c in GRUPO], observed=True).rolling(
+        janela, min_periods=MIN_OBSERVACOES - 1)
+    media = movel.mean().droplevel(list(range(len(GRUPO)))).reindex(df.index)
+    desvio = movel.std().droplevel(list(range(len(GRUPO)))).reindex(df.index)
+
+    score = (df['valor'] - media) / desvio.replace(0, np.nan)
+    return score, media
+
+
+def detectar_anomalias(registros, metodo='mad', limiar=LIMIAR_PADRAO, janela=JANELA_PADRAO):
+    """Lista de despesas atípicas ordenada pela intensidade do desvio.
+
+    metodo='mad' compara cada valor com a mediana/MAD do grupo
+    empresa x subcategoria x fornecedor; metodo='janela' compara com a
+    média/desvio móveis dos lançamentos anteriores do mesmo grupo.
+    """
+    if not registros:
+        return []
+
+    df = despesas_para_dataframe(registros)
+    if metodo == 'mad':
+        score, referencia = pontuar_mad(df)
+    elif metodo == 'janela':
+        score, referencia = pontuar_janela(df, janela)
+    else:
+        raise ValueError(f"Método desconhecido: {metodo}")
+
+    df['referencia'] = referencia.round(2)
+    df['score'] = score.round(2)
+    sinalizados = df[df['score'].abs() >= limiar]
+    sinalizados = sinalizados.reindex(sinalizados['score'].abs().sort_values(ascending=False).index)
+
+    colunas = [c for c in ['id', 'empresa', 'ano', 'mes', 'categoria', 'subcategoria',
+                           'fornecedor', 'valor', 'referencia', 'score'] if c in sinalizados]
+    saida = sinalizados[colunas].astype({c: str for c in GRUPO})
+    return json.loads(saida.to_json(orient='records', force_ascii=False))
+
+
+def main():
+    with open(DADOS_DIR / 'despesas.json', 'r', encoding='utf-8') as f:
+        registros = json.load(f)
+
+    anomalias = detectar_anomalias(registros)
+
+    print("=" * 60)
+    print("ANOMALIAS EM DESPESAS")
+    print("=" * 60)
+    print(f"Registros analisados: {len(registros)}")
+    print(f"Registros sinalizados: {len(anomalias)}")
+    print()
+    for item in anomalias[:10]:
+        print(f"  {item['empresa']} | mês {item['mes']} | {item['subcategoria']} | {item['fornecedor']}: "
+              f"R$ {item['valor']:,.2f} (ref. R$ {item['referencia']:,.2f}, score {item['score']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+import argparse
+import asyncio
+import hashlib
+import http.client
+import io
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+import pandas as pd
+
+from converter_excels_para_json import OUTPUT_DIR, ROTAS_ABAS, identificar_dataset, registros_tabela, salvar_datasets
+from mesclar_dados import gravar_json_atomico
+
+POR_HOST_PADRAO = 4
+TIMEOUT_PADRAO = 30
+MAX_REDIRECIONAMENTOS = 5
+REDIRECIONAMENTOS = {301, 302, 303, 307, 308}
+
+
+def url_exportacao_csv(spreadsheet_id, gid=0):
+    """URL de exportação CSV de uma aba do Google Sheets"""
+    return f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/export?format=csv&gid={gid}"
+
+
+def nome_origem(url):
+    """Nome estável dos arquivos de uma URL: '<id>_gid<gid>' no Google Sheets, senão caminho + hash da query"""
+    partes = urlsplit(url)
+    planilha = re.search(r'/spreadsheets/d/([^/]+)', partes.path)
+    if planilha:
+        gid = parse_qs(partes.query).get('gid', ['0'])[0]
+        return f"{planilha.group(1)}_gid{gid}"
+    nome = Path(partes.path).stem or partes.netloc
+    # '/export?id=1' e '/export?id=2' são fontes diferentes e não podem gravar no mesmo arquivo
+    if partes.query:
+        nome += '_' + hashlib.sha1(partes.query.encode('utf-8')).hexdigest()[:8]
+    return nome
+
+
+class PoolConexoes:
+    """Conexões HTTP keep-alive reaproveitadas por host"""
+
+    def __init__(self, timeout=TIMEOUT_PADRAO):
+        self.timeout = timeout
+        self._livres = {}
+        self._lock = threading.Lock()
+
+    def obter(self, esquema, host):
+        with self._lock:
+            livres = self._livres.get((esquema, host))
+            if livres:
+                return livres.pop()
+        classe = http.client.HTTPSConnection if esquema == 'https' else http.client.HTTPConnection
+        return classe(host, timeout=self.timeout)
+
+    def devolver(self, esquema, host, conexao):
+        with self._lock:
+            self._livres.setdefault((esquema, host), []).append(conexao)
+
+    def fechar(self):
+        with self._lock:
+            for livres in self._livres.values():
+                for conexao in livres:
+                    conexao.close()
+            self._livres.clear()
+
+
+def converter_csv(fluxo, nome=''):
+    """Converte um CSV (lido direto do stream) com o mesmo roteamento das abas do Excel"""
+    texto = io.TextIOWrapper(fluxo, encoding='utf-8-sig', newline='')
+    try:
+        df = pd.read_csv(texto)
+    finally:
+        texto.detach()
+
+    dataset = identificar_dataset(nome, df.columns)
+    mapear = ROTAS_ABAS[dataset][2] if dataset else registros_tabela
+    return dataset, mapear(df)
+
+
+def _requisitar(pool, url, cabecalhos):
+    """Envia um GET pela conexão do pool; devolve (partes da URL, conexão, resposta)"""
+    partes = urlsplit(url)
+    caminho = partes.path or '/'
+    if partes.query:
+        caminho += '?' + partes.query
+
+    # Uma conexão ociosa do pool pode ter sido fechada pelo servidor: tenta de novo com outra
+    for tentativa in range(2):
+        conexao = pool.obter(partes.scheme, partes.netloc)
+        try:
+            conexao.request('GET', caminho, headers=cabecalhos)
+            return partes, conexao, conexao.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conexao.close()
+            if tentativa:
+                raise
+
+
+def _liberar(pool, partes, conexao, resposta):
+    if resposta.will_close:
+        conexao.close()
+    else:
+        pool.devolver(partes.scheme, partes.netloc, conexao)
+
+
+def _buscar(pool, url, destino, validadores, converter):
+    """Um GET condicional bloqueante em 'destino'; roda no executor a partir do loop asyncio.
+
+    Um redirecionamento volta como {'status': 3xx, 'redirecionar': URL} para
+    que o loop siga o próximo salto sob o semáforo do host de destino.
+    Resultado e validadores ficam sempre associados à URL original.
+    """
+    cabecalhos = {}
+    if validadores.get('etag'):
+        cabecalhos['If-None-Match'] = validadores['etag']
+    if validadores.get('last_modified'):
+        cabecalhos['If-Modified-Since'] = validadores['last_modified']
+
+    partes, conexao, resposta = _requisitar(pool, destino, cabecalhos)
+    try:
+        if resposta.status in REDIRECIONAMENTOS and resposta.getheader('Location'):
+            resposta.read()
+            resultado = {'url': url, 'status': resposta.status,
+                         'redirecionar': urljoin(destino, resposta.getheader('Location'))}
+        elif resposta.status == 304:
+            resposta.read()
+            resultado = {'url': url, 'status': 304, 'validadores': validadores}
+        elif resposta.status == 200:
+            dataset, registros = converter(resposta, nome_origem(url))
+            resposta.read()
+            resultado = {
+                'url': url,
+                'status': 200,
+                'dataset': dataset,
+                'registros': registros,
+                'validadores': {
+                    'etag': resposta.getheader('ETag'),
+                    'last_modified': resposta.getheader('Last-Modified'),
+                },
+            }
+        else:
+            resposta.read()
+            resultado = {'url': url, 'status': resposta.status, 'erro': resposta.reason}
+
+        _liberar(pool, partes, conexao, resposta)
+        return resultado
+    except Exception:
+        conexao.close()
+        raise
+
+
+async def buscar_planilhas(urls, cache=None, por_host=POR_HOST_PADRAO, converter=converter_csv,
+                           timeout=TIMEOUT_PADRAO):
+    """Busca várias exportações CSV em paralelo.
+
+    'cache' é um dict {url: {'etag', 'last_modified'}} atualizado no lugar;
+    URLs inalteradas voltam com status 304 sem download nem conversão. Cada
+    requisição, inclusive cada salto de redirecionamento, ocupa uma vaga do
+    semáforo do seu host ('por_host' simultâneas), e as conexões são
+    reaproveitadas entre requisições. As requisições bloqueantes rodam num
+    executor próprio com uma thread por URL no máximo (criadas sob demanda),
+    então o limite efetivo é o dos semáforos, e não o executor padrão do asyncio.
+    """
+    urls = list(urls)
+    cache = {} if cache is None else cache
+    pool = PoolConexoes(timeout)
+    executor = ThreadPoolExecutor(max_workers=max(1, len(urls)), thread_name_prefix='buscar_planilhas')
+    loop = asyncio.get_running_loop()
+    semaforos = {}
+
+    async def buscar(url):
+        destino = url
+        validadores = cache.get(url, {})
+        for _ in range(MAX_REDIRECIONAMENTOS + 1):
+            host = urlsplit(destino).netloc
+            async with semaforos.setdefault(host, asyncio.Semaphore(por_host)):
+                try:
+                    resultado = await loop.run_in_executor(executor, _buscar, pool, url, destino, validadores,
+                                                           converter)
+                except Exception as e:
+                    return {'url': url, 'status': None, 'erro': str(e)}
+            if 'redirecionar' not in resultado:
+                break
+            destino = resultado['redirecionar']
+        else:
+            return {'url': url, 'status': None, 'erro': f'mais de {MAX_REDIRECIONAMENTOS} redirecionamentos'}
+
+        if resultado['status'] == 200:
+            cache[url] = resultado['validadores']
+        return resultado
+
+    try:
+        return await asyncio.gather(*(buscar(url) for url in urls))
+    finally:
+        executor.shutdown(wait=False)
+        pool.fechar()
+
+
+def carregar_cache(arquivo):
+    arquivo = Path(arquivo)
+    if not arquivo.exists():
+        return {}
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def salvar_cache(arquivo, cache):
+    gravar_json_atomico(arquivo, cache)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Busca exportações CSV de planilhas em paralelo')
+    parser.add_argument('urls', nargs='+', help='URLs de exportação CSV')
+    parser.add_argument('--cache', type=Path, help='Arquivo JSON com ETag/Last-Modified por URL')
+    parser.add_argument('--por-host', type=int, default=POR_HOST_PADRAO,
+                        help='Requisições simultâneas por host')
+    parser.add_argument('--saida', type=Path, default=OUTPUT_DIR, help='Pasta onde os JSON convertidos são gravados')
+    args = parser.parse_args()
+
+    cache = carregar_cache(args.cache) if args.cache else {}
+    resultados = asyncio.run(buscar_planilhas(args.urls, cache, por_host=args.por_host))
+
+    args.saida.mkdir(parents=True, exist_ok=True)
+    for resultado in resultados:
+        if resultado['status'] == 200:
+            print(f"✅ {resultado['url']}: {len(resultado['registros'])} registros ({resultado['dataset']})")
+            salvar_datasets(nome_origem(resultado['url']),
+                            {resultado['dataset'] or 'tabela': resultado['registros']}, args.saida)
+        elif resultado['status'] == 304:
+            print(f"⏭️  {resultado['url']}: sem alterações")
+        else:
+            print(f"❌ {resultado['url']}: {resultado.get('erro')}")
+
+    # Só depois de gravar os dados: se a gravação falhar, a próxima execução baixa de novo
+    if args.cache:
+        salvar_cache(args.cache, cache)
+
+if __name__ == '__main__':
+    main()
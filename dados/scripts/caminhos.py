@@ -0,0 +1,9 @@
+import os
+from pathlib import Path
+
+# Caminhos resolvidos a partir deste arquivo (ou de FINANCEFLOW_DADOS_DIR), nunca do diretório atual
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DADOS_DIR = Path(os.environ.get('FINANCEFLOW_DADOS_DIR', SCRIPTS_DIR.parent)).resolve()
+EXCEL_DIR = DADOS_DIR / 'excel_exemplos'
+PARTICIONADO_DIR = DADOS_DIR / 'particionado'
+RAIZ_DIR = DADOS_DIR.parent
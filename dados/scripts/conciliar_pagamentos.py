@@ -0,0 +1,162 @@
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from caminhos import DADOS_DIR
+
+TOLERANCIA_DIAS = 3
+TOLERANCIA_VALOR = 0.01
+TOLERANCIA_PERCENTUAL = 0.0
+
+# Campo de vencimento por ordem de preferência (despesas do conversor só têm 'data')
+CAMPOS_DATA = ('data_vencimento', 'data', 'data_lancamento')
+
+
+def _preparar(registros, prefixo):
+    """DataFrame com id, empresa, dia (inteiro) e valor para a junção, e os ids descartados.
+
+    Lançamentos sem data ou valor legível não entram na junção, mas seus
+    ids voltam na segunda posição para serem reportados como inválidos.
+    """
+    df = pd.DataFrame(registros)
+    if df.empty:
+        return pd.DataFrame(columns=['id', 'empresa', 'dia', 'valor', 'categoria']), []
+    if 'id' not in df:
+        df['id'] = [f'{prefixo}_{i}' for i in range(len(df))]
+    texto_data = pd.Series(pd.NA, index=df.index, dtype=object)
+    for campo in CAMPOS_DATA:
+        if campo in df:
+            texto_data = texto_data.fillna(df[campo].replace('', pd.NA))
+    # dd/mm/aaaa (formato dos geradores) em modo rápido; o resto cai no parser genérico
+    datas = pd.to_datetime(texto_data, format='%d/%m/%Y', errors='coerce')
+    faltantes = datas.isna() & texto_data.notna()
+    if faltantes.any():
+        datas[faltantes] = pd.to_datetime(texto_data[faltantes], errors='coerce', format='mixed')
+    preparado = pd.DataFrame({
+        'id': df['id'].astype(str),
+        'empresa': df['empresa'].astype(str),
+        'dia': (datas - pd.Timestamp('1970-01-01')).dt.days,
+        'valor': pd.to_numeric(df['valor'], errors='coerce'),
+        'categoria': df.get('subcategoria', df.get('categoria', pd.Series('', index=df.index)))
+                       .astype(str).str.strip().str.lower(),
+    })
+    invalidos = preparado['dia'].isna() | preparado['valor'].isna()
+    return preparado[~invalidos].astype({'dia': 'int64'}), preparado.loc[invalidos, 'id'].tolist()
+
+
+def candidatos(fluxo, despesas, tolerancia_dias=TOLERANCIA_DIAS, tolerancia_valor=TOLERANCIA_VALOR,
+               tolerancia_percentual=TOLERANCIA_PERCENTUAL, mesma_categoria=False):
+    """Pares (fluxo, despesa) dentro das tolerâncias, via hash join por empresa e faixa de datas.
+
+    Cada lançamento cai na faixa dia // (tolerancia_dias + 1); como um par
+    válido nunca está a mais de uma faixa de distância, as despesas são
+    replicadas nas faixas vizinhas e a junção vira um merge por igualdade,
+    sem comparar todos contra todos.
+    """
+    largura = tolerancia_dias + 1
+    empresas = pd.Index(pd.concat([fluxo['empresa'], despesas['empresa']]).unique())
+
+    # Só chaves inteiras e posições passam pelo merge; ids e textos entram depois do filtro
+    chaves_fluxo = pd.DataFrame({
+        'empresa': empresas.get_indexer(fluxo['empresa']),
+        'faixa': fluxo['dia'].to_numpy() // largura,
+        'pos_fluxo': np.arange(len(fluxo)),
+    })
+    base = pd.DataFrame({
+        'empresa': empresas.get_indexer(despesas['empresa']),
+        'faixa': despesas['dia'].to_numpy() // largura,
+        'pos_despesa': np.arange(len(despesas)),
+    })
+    vizinhas = pd.concat([base.assign(faixa=base['faixa'] + d) for d in (-1, 0, 1)], ignore_index=True)
+    juncao = chaves_fluxo.merge(vizinhas, on=['empresa', 'faixa'])
+
+    pf = juncao['pos_fluxo'].to_numpy()
+    pd_ = juncao['pos_despesa'].to_numpy()
+    diferenca_dias = np.abs(despesas['dia'].to_numpy()[pd_] - fluxo['dia'].to_numpy()[pf])
+    valor_fluxo = fluxo['valor'].to_numpy()[pf]
+    valor_despesa = despesas['valor'].to_numpy()[pd_]
+    diferenca_valor = np.abs(valor_despesa - valor_fluxo)
+    limite_valor = np.maximum(tolerancia_valor, tolerancia_percentual * np.abs(valor_fluxo))
+
+    filtro = (diferenca_dias <= tolerancia_dias) & (diferenca_valor <= limite_valor)
+    if mesma_categoria:
+        filtro &= despesas['categoria'].to_numpy()[pd_] == fluxo['categoria'].to_numpy()[pf]
+    pf, pd_ = pf[filtro], pd_[filtro]
+    return pd.DataFrame({
+        'id_fluxo': fluxo['id'].to_numpy()[pf],
+        'id_despesa': despesas['id'].to_numpy()[pd_],
+        'empresa': fluxo['empresa'].to_numpy()[pf],
+        'valor_fluxo': valor_fluxo[filtro],
+        'valor_despesa': valor_despesa[filtro],
+        'diferenca_dias': diferenca_dias[filtro],
+        'diferenca_valor': diferenca_valor[filtro],
+    })
+
+
+def conciliar(cash_flow, despesas, tolerancia_dias=TOLERANCIA_DIAS, tolerancia_valor=TOLERANCIA_VALOR,
+              tolerancia_percentual=TOLERANCIA_PERCENTUAL, mesma_categoria=False):
+    """Concilia os lançamentos 'Pagar' do fluxo de caixa com as despesas.
+
+    Retorna um dict com:
+      - conciliados: pares em que cada lado tem exatamente um candidato
+      - ambiguos: lançamentos do fluxo com mais de um candidato (ou cujo
+        candidato também casa com outro lançamento), com a lista de ids
+      - sem_par_fluxo / sem_par_despesas: ids sem nenhum candidato
+      - invalidos_fluxo / invalidos_despesas: ids com data ou valor ilegível,
+        que não puderam participar da conciliação
+    """
+    pagar = [r for r in cash_flow if r.get('tipo') == 'Pagar']
+    fluxo, invalidos_fluxo = _preparar(pagar, 'cf')
+    desp, invalidos_despesas = _preparar(despesas, 'desp')
+
+    pares = candidatos(fluxo, desp, tolerancia_dias, tolerancia_valor, tolerancia_percentual, mesma_categoria)
+    por_fluxo = pares.groupby('id_fluxo')['id_despesa'].transform('size')
+    por_despesa = pares.groupby('id_despesa')['id_fluxo'].transform('size')
+    unicos = (por_fluxo == 1) & (por_despesa == 1)
+
+    ambiguos = pares[~unicos].sort_values(['id_fluxo', 'diferenca_valor', 'diferenca_dias'])
+    return {
+        'conciliados': json.loads(pares[unicos].to_json(orient='records', force_ascii=False)),
+        'ambiguos': [
+            {'id_fluxo': id_fluxo, 'candidatos': grupo['id_despesa'].tolist()}
+            for id_fluxo, grupo in ambiguos.groupby('id_fluxo', sort=False)
+        ],
+        'sem_par_fluxo': fluxo.loc[~fluxo['id'].isin(pares['id_fluxo']), 'id'].tolist(),
+        'sem_par_despesas': desp.loc[~desp['id'].isin(pares['id_despesa']), 'id'].tolist(),
+        'invalidos_fluxo': invalidos_fluxo,
+        'invalidos_despesas': invalidos_despesas,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concilia contas a pagar do fluxo de caixa com as despesas')
+    parser.add_argument('--dias', type=int, default=TOLERANCIA_DIAS, help='Tolerância de vencimento em dias')
+    parser.add_argument('--valor', type=float, default=TOLERANCIA_VALOR, help='Tolerância absoluta de valor')
+    parser.add_argument('--percentual', type=float, default=TOLERANCIA_PERCENTUAL,
+                        help='Tolerância relativa de valor (ex.: 0.01 = 1%%)')
+    parser.add_argument('--mesma-categoria', action='store_true',
+                        help='Exige categoria do fluxo igual à subcategoria da despesa')
+    args = parser.parse_args()
+
+    with open(DADOS_DIR / 'cash_flow.json', 'r', encoding='utf-8') as f:
+        cash_flow = json.load(f)
+    with open(DADOS_DIR / 'despesas.json', 'r', encoding='utf-8') as f:
+        despesas = json.load(f)
+
+    resultado = conciliar(cash_flow, despesas, args.dias, args.valor, args.percentual, args.mesma_categoria)
+
+    print("=" * 60)
+    print("CONCILIAÇÃO FLUXO DE CAIXA x DESPESAS")
+    print("=" * 60)
+    print(f"Conciliados: {len(resultado['conciliados'])}")
+    print(f"Ambíguos: {len(resultado['ambiguos'])}")
+    print(f"Sem par no fluxo de caixa: {len(resultado['sem_par_fluxo'])}")
+    print(f"Sem par nas despesas: {len(resultado['sem_par_despesas'])}")
+    print(f"Inválidos (data/valor ilegível): {len(resultado['invalidos_fluxo'])} no fluxo, "
+          f"{len(resultado['invalidos_despesas'])} nas despesas")
+
+
+if __name__ == '__main__':
+    main()
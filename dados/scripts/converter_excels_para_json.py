@@ -1,10 +1,109 @@
+import argparse
 import pandas as pd
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from caminhos import EXCEL_DIR
+from ingestao_csv import EXTENSOES_CSV, ler_csv, normalizar_coluna
+from mesclar_dados import ano_registro, chaves_estaveis, gravar_json_atomico, mesclar_arquivo_json
+from particionar_dados import MESES, gravar_particionado
+
 # Diretório base
-BASE_DIR = Path(__file__).parent.parent / 'excel_exemplos'
-OUTPUT_DIR = Path(__file__).parent.parent / 'excel_exemplos'
+BASE_DIR = EXCEL_DIR
+OUTPUT_DIR = EXCEL_DIR
+
+def _mes(row):
+    """Lê o mês como número, aceitando Mes_Num, Mês/Mes ou o nome do mês"""
+    valor = row.get('Mes_Num', row.get('Mês', row.get('Mes', row.get('mes', 0))))
+    if isinstance(valor, str):
+        nome = valor.strip().lower()
+        return MESES.index(nome) + 1 if nome in MESES else int(valor)
+    return int(valor)
+
+def _ano(row):
+    """Lê o ano da coluna Ano ou, na falta dela, da data da linha; None se não houver"""
+    valor = row.get('Ano', row.get('ano'))
+    if valor is None or pd.isna(valor):
+        data = row.get('Data', row.get('data', row.get('Data_Vencimento', '')))
+        return ano_registro({'data': str(data)}) or None
+    return int(valor)
+
+def registros_dashboard_financeiro(df):
+    """Mapeia as linhas do Dashboard Financeiro para registros JSON"""
+    dados = []
+    for _, row in df.iterrows():
+        dados.append({
+            'mes': _mes(row),
+            'empresa': str(row.get('Empresa', row.get('empresa', ''))),
+            'receita': float(row.get('Receita', row.get('receita', 0))),
+            'custo': float(row.get('Custo', row.get('custo', 0))),
+            'despesa': float(row.get('Despesa', row.get('despesa', 0))),
+            'lucro': float(row.get('Lucro', row.get('lucro', 0)))
+        })
+    return dados
+
+def registros_despesas(df):
+    """Mapeia as linhas de despesas para registros JSON com IDs estáveis"""
+    dados = []
+    for _, row in df.iterrows():
+        dados.append({
+            'ano': _ano(row),
+            'mes': _mes(row),
+            'empresa': str(row.get('Empresa', row.get('empresa', ''))),
+            'categoria': str(row.get('Categoria', row.get('categoria', ''))),
+            'subcategoria': str(row.get('Subcategoria', row.get('subcategoria', ''))),
+            'descricao': str(row.get('Descrição', row.get('descricao', row.get('Descricao', '')))),
+            'valor': float(row.get('Valor', row.get('valor', row.get('Valor_Quitacao', 0)))),
+            'tipo': str(row.get('Tipo', row.get('tipo', 'Despesa'))),
+            'status': str(row.get('Status', row.get('status', 'Pago'))),
+            'data': str(row.get('Data', row.get('data', row.get('Data_Vencimento', '')))),
+            'fornecedor': str(row.get('Fornecedor', row.get('fornecedor', '')))
+        })
+    
+    # IDs derivados do conteúdo, estáveis entre reenvios da mesma planilha
+    for chave, registro in zip(chaves_estaveis(dados), dados):
+        registro['id'] = f'desp_{chave}'
+    return dados
+
+def registros_balancete(df):
+    """Mapeia as linhas do Balancete para registros JSON"""
+    dados = []
+    for idx, row in df.iterrows():
+        dados.append({
+            'id': f'bal_{idx + 1}',
+            'mes': _mes(row),
+            'empresa': str(row.get('Empresa', row.get('empresa', ''))),
+            'conta': str(row.get('Conta', row.get('conta', ''))),
+            'categoria': str(row.get('Categoria', row.get('categoria', ''))),
+            'subcategoria': str(row.get('Subcategoria', row.get('subcategoria', ''))),
+            'valor': float(row.get('Valor', row.get('valor', row.get('Saldo', 0)))),
+            'tipo': str(row.get('Tipo', row.get('tipo', 'Ativo'))),
+            'nivel': int(row.get('Nível', row.get('nivel', row.get('Nivel', 1))))
+        })
+    return dados
+
+def registros_cash_flow(df):
+    """Mapeia as linhas do Fluxo de Caixa para registros JSON"""
+    dados = []
+    for idx, row in df.iterrows():
+        dados.append({
+            'id': str(row.get('ID', row.get('id', f'cf_{idx + 1}'))),
+            'mes': _mes(row),
+            'empresa': str(row.get('Empresa', row.get('empresa', ''))),
+            'tipo': str(row.get('Tipo', row.get('tipo', ''))),
+            'categoria': str(row.get('Categoria', row.get('categoria', ''))),
+            'data_vencimento': str(row.get('Data Vencimento', row.get('data_vencimento', ''))),
+            'valor': float(row.get('Valor', row.get('valor', 0))),
+            'status': str(row.get('Status', row.get('status', ''))),
+            'responsavel': str(row.get('Responsável', row.get('responsavel', '')))
+        })
+    return dados
+
+def registros_tabela(df):
+    """Mapeamento genérico: colunas em minúsculas, células vazias como None"""
+    df = df.rename(columns=lambda c: str(c).strip().lower())
+    return json.loads(df.to_json(orient='records', force_ascii=False, date_format='iso'))
 
 def converter_dashboard_financeiro():
     """Converte Dashboard_Financeiro_Exemplo.xlsx para JSON"""
@@ -16,21 +115,11 @@ def converter_dashboard_financeiro():
     df = pd.read_excel(arquivo)
     
     # Converter para lista de dicionários
-    dados = []
-    for _, row in df.iterrows():
-        dados.append({
-            'mes': int(row.get('Mês', row.get('mes', 0))),
-            'empresa': str(row.get('Empresa', row.get('empresa', ''))),
-            'receita': float(row.get('Receita', row.get('receita', 0))),
-            'custo': float(row.get('Custo', row.get('custo', 0))),
-            'despesa': float(row.get('Despesa', row.get('despesa', 0))),
-            'lucro': float(row.get('Lucro', row.get('lucro', 0)))
-        })
+    dados = registros_dashboard_financeiro(df)
     
     # Salvar JSON
     output_file = OUTPUT_DIR / 'dados_dashboard_financeiro_exemplo.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(dados, f, ensure_ascii=False, indent=2)
+    gravar_json_atomico(output_file, dados)
     
     print(f"✅ Dashboard Financeiro convertido: {len(dados)} registros")
     print(f"   Salvo em: {output_file}")
@@ -45,26 +134,11 @@ def converter_analise_despesas():
     df = pd.read_excel(arquivo)
     
     # Converter para lista de dicionários
-    dados = []
-    for idx, row in df.iterrows():
-        dados.append({
-            'id': f'desp_{idx + 1}',
-            'mes': int(row.get('Mês', row.get('mes', 0))),
-            'empresa': str(row.get('Empresa', row.get('empresa', ''))),
-            'categoria': str(row.get('Categoria', row.get('categoria', ''))),
-            'subcategoria': str(row.get('Subcategoria', row.get('subcategoria', ''))),
-            'descricao': str(row.get('Descrição', row.get('descricao', row.get('Descricao', '')))),
-            'valor': float(row.get('Valor', row.get('valor', 0))),
-            'tipo': str(row.get('Tipo', row.get('tipo', 'Despesa'))),
-            'status': str(row.get('Status', row.get('status', 'Pago'))),
-            'data': str(row.get('Data', row.get('data', ''))),
-            'fornecedor': str(row.get('Fornecedor', row.get('fornecedor', '')))
-        })
+    dados = registros_despesas(df)
     
-    # Salvar JSON
+    # Mesclar com o JSON existente (só insere/atualiza/remove o que mudou)
     output_file = OUTPUT_DIR / 'dados_despesas_exemplo.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(dados, f, ensure_ascii=False, indent=2)
+    mesclar_arquivo_json(output_file, dados)
     
     print(f"✅ Análise de Despesas convertida: {len(dados)} registros")
     print(f"   Salvo em: {output_file}")
@@ -81,28 +155,15 @@ def converter_balancete():
         xls = pd.ExcelFile(arquivo)
         print(f"   Abas encontradas: {xls.sheet_names}")
         
-        # Ler primeira aba ou aba específica
-        df = pd.read_excel(arquivo, sheet_name=0)
+        # Ler primeira aba do arquivo já aberto
+        df = xls.parse(0)
         
         # Converter para lista de dicionários
-        dados = []
-        for idx, row in df.iterrows():
-            dados.append({
-                'id': f'bal_{idx + 1}',
-                'mes': int(row.get('Mês', row.get('mes', row.get('Mes', 0)))),
-                'empresa': str(row.get('Empresa', row.get('empresa', ''))),
-                'conta': str(row.get('Conta', row.get('conta', ''))),
-                'categoria': str(row.get('Categoria', row.get('categoria', ''))),
-                'subcategoria': str(row.get('Subcategoria', row.get('subcategoria', ''))),
-                'valor': float(row.get('Valor', row.get('valor', row.get('Saldo', 0)))),
-                'tipo': str(row.get('Tipo', row.get('tipo', 'Ativo'))),
-                'nivel': int(row.get('Nível', row.get('nivel', row.get('Nivel', 1))))
-            })
+        dados = registros_balancete(df)
         
         # Salvar JSON
         output_file = OUTPUT_DIR / 'dados_balancete_exemplo.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(dados, f, ensure_ascii=False, indent=2)
+        gravar_json_atomico(output_file, dados)
         
         print(f"✅ Balancete convertido: {len(dados)} registros")
         print(f"   Salvo em: {output_file}")
@@ -110,7 +171,158 @@ def converter_balancete():
     except Exception as e:
         print(f"❌ Erro ao converter Balancete: {e}")
 
-def main():
+# Roteamento de abas: dataset -> (nomes de aba, colunas que identificam o cabeçalho, mapeamento)
+ROTAS_ABAS = {
+    'despesas': (
+        {'despesas', 'despesas_detalhadas'},
+        {'Empresa', 'Categoria', 'Subcategoria'},
+        registros_despesas,
+    ),
+    'faturamento': (
+        {'faturamento'},
+        {'Empresa', 'Faturamento_Bruto'},
+        registros_tabela,
+    ),
+    'resumo_categoria': (
+        {'resumo_categoria'},
+        {'Empresa', 'Mes', 'Categoria', 'Valor_Emissao'},
+        registros_tabela,
+    ),
+    'resumo_mensal': (
+        {'resumo_mensal'},
+        {'Empresa', 'Mes_Num', 'Valor_Emissao'},
+        registros_tabela,
+    ),
+    'cash_flow': (
+        {'fluxo de caixa', 'cash_flow'},
+        {'Empresa', 'Tipo', 'Data Vencimento', 'Valor'},
+        registros_cash_flow,
+    ),
+    'balancete': (
+        {'balancete'},
+        {'Conta', 'Saldo'},
+        registros_balancete,
+    ),
+    'dashboard_financeiro': (
+        {'dashboard financeiro', 'dashboard_financeiro'},
+        {'Empresa', 'Receita', 'Custo'},
+        registros_dashboard_financeiro,
+    ),
+}
+
+def identificar_dataset(nome_aba, colunas):
+    """Identifica o dataset de uma aba pelo nome ou, se não bater, pela assinatura do cabeçalho.
+    
+    Nomes e colunas são comparados normalizados (sem acento, caixa ou
+    espaços), então 'empresa;categoria;subcategoria' de um ERP também casa.
+    """
+    nome = normalizar_coluna(nome_aba)
+    for dataset, (nomes, _, _) in ROTAS_ABAS.items():
+        if nome in {normalizar_coluna(n) for n in nomes}:
+            return dataset
+    
+    colunas = {normalizar_coluna(c) for c in colunas}
+    candidatos = [
+        (len(assinatura), dataset)
+        for dataset, (_, assinatura, _) in ROTAS_ABAS.items()
+        if {normalizar_coluna(c) for c in assinatura} <= colunas
+    ]
+    return max(candidatos)[1] if candidatos else None
+
+def _alinhar_colunas(df, dataset):
+    """Cabeçalho que só casou normalizado ('EMPRESA', 'mês') passa aos nomes normalizados, que os mapeamentos aceitam"""
+    if ROTAS_ABAS[dataset][1] <= {str(c).strip() for c in df.columns}:
+        return df
+    return df.rename(columns=normalizar_coluna)
+
+def _converter_aba(arquivo, nome_aba, dataset):
+    """Lê e converte uma aba (usado pelos workers no modo paralelo)"""
+    df = pd.read_excel(arquivo, sheet_name=nome_aba)
+    return nome_aba, dataset, ROTAS_ABAS[dataset][2](_alinhar_colunas(df, dataset))
+
+def converter_pasta_de_trabalho(arquivo, paralelo=False, max_workers=None):
+    """Converte todas as abas reconhecidas de um Excel em uma única passada.
+    
+    No modo sequencial o arquivo é aberto uma vez; cada aba é roteada para o
+    dataset pelo nome ou pela assinatura do cabeçalho. Abas não reconhecidas
+    (ex.: Documentacao) são ignoradas. Retorna {dataset: registros}.
+    
+    Com paralelo=True, a leitura das abas é distribuída entre processos e
+    cada worker reabre o arquivo (um ExcelFile não atravessa processos). É
+    uma troca deliberada: o parser do openpyxl é Python puro e não ganha nada
+    com threads sobre um único ExcelFile, enquanto em processos cada worker
+    paga a abertura do zip e das strings compartilhadas, mas só analisa a
+    sua aba (modo read_only). Vale para pastas de trabalho com várias abas
+    grandes; para arquivos pequenos o modo sequencial é mais rápido.
+    """
+    arquivo = Path(arquivo)
+    if not arquivo.exists():
+        print(f"Arquivo não encontrado: {arquivo}")
+        return {}
+    
+    resultados = []
+    with pd.ExcelFile(arquivo) as xls:
+        # Só o cabeçalho é lido para rotear as abas
+        rotas = []
+        for nome_aba in xls.sheet_names:
+            dataset = identificar_dataset(nome_aba, xls.parse(nome_aba, nrows=0).columns)
+            if dataset is None:
+                print(f"   Aba ignorada: {nome_aba}")
+                continue
+            rotas.append((nome_aba, dataset))
+        
+        if not paralelo or len(rotas) < 2:
+            for nome_aba, dataset in rotas:
+                df = _alinhar_colunas(xls.parse(nome_aba), dataset)
+                resultados.append((nome_aba, dataset, ROTAS_ABAS[dataset][2](df)))
+    
+    if paralelo and len(rotas) >= 2:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futuros = [executor.submit(_converter_aba, arquivo, nome_aba, dataset) for nome_aba, dataset in rotas]
+            resultados = [futuro.result() for futuro in futuros]
+    
+    datasets = {}
+    for nome_aba, dataset, dados in resultados:
+        datasets.setdefault(dataset, []).extend(dados)
+        print(f"✅ Aba {nome_aba} -> {dataset}: {len(dados)} registros")
+    return datasets
+
+def converter_arquivo_csv(arquivo, paralelo=None):
+    """Converte um CSV/TSV com o mesmo roteamento e mapeamento das abas do Excel"""
+    arquivo = Path(arquivo)
+    if not arquivo.exists():
+        print(f"Arquivo não encontrado: {arquivo}")
+        return {}
+    
+    df = ler_csv(arquivo, paralelo=paralelo)
+    dataset = identificar_dataset(arquivo.stem, df.columns)
+    if dataset is None:
+        print(f"   Arquivo ignorado (cabeçalho não reconhecido): {arquivo.name}")
+        return {}
+    
+    dados = ROTAS_ABAS[dataset][2](_alinhar_colunas(df, dataset))
+    print(f"✅ {arquivo.name} -> {dataset}: {len(dados)} registros")
+    return {dataset: dados}
+
+def converter_arquivo(arquivo, paralelo=False):
+    """Escolhe o leitor pela extensão: CSV/TSV ou pasta de trabalho Excel"""
+    if Path(arquivo).suffix.lower() in EXTENSOES_CSV:
+        return converter_arquivo_csv(arquivo, paralelo=None if paralelo else False)
+    return converter_pasta_de_trabalho(arquivo, paralelo=paralelo)
+
+def salvar_datasets(arquivo, datasets, pasta=None):
+    """Grava um JSON por dataset (despesas passam pela mesclagem incremental)"""
+    arquivo = Path(arquivo)
+    pasta = OUTPUT_DIR if pasta is None else Path(pasta)
+    for dataset, dados in datasets.items():
+        output_file = pasta / f'dados_{dataset}_{arquivo.stem}.json'
+        if dataset == 'despesas':
+            mesclar_arquivo_json(output_file, dados)
+        else:
+            gravar_json_atomico(output_file, dados)
+        print(f"   Salvo em: {output_file}")
+
+def converter_exemplos():
     print("=" * 60)
     print("CONVERTENDO ARQUIVOS EXCEL PARA JSON")
     print("=" * 60)
@@ -127,5 +339,34 @@ def main():
     print("CONVERSÃO CONCLUÍDA!")
     print("=" * 60)
 
+def main():
+    parser = argparse.ArgumentParser(description='Converte arquivos Excel ou CSV/TSV para JSON')
+    parser.add_argument('arquivos', nargs='*', type=Path,
+                        help='Pastas de trabalho (todas as abas) ou CSV/TSV a converter (padrão: exemplos fixos)')
+    parser.add_argument('--paralelo', action='store_true', help='Processa as abas (ou blocos do CSV) em paralelo')
+    parser.add_argument('--particionado', type=Path, metavar='DIR',
+                        help='Também grava cada dataset particionado por empresa/ano/mês em DIR')
+    parser.add_argument('--ano-padrao', type=int,
+                        help='Ano das partições para registros sem ano nem data (ex.: Resumo_Categoria)')
+    args = parser.parse_args()
+    
+    if not args.arquivos:
+        converter_exemplos()
+        return
+    
+    # Registros de todos os arquivos, por dataset, para gravar cada partição uma única vez
+    particionados = {}
+    for arquivo in args.arquivos:
+        print(f"📂 {arquivo}")
+        datasets = converter_arquivo(arquivo, paralelo=args.paralelo)
+        salvar_datasets(arquivo, datasets)
+        for dataset, dados in datasets.items():
+            particionados.setdefault(dataset, []).extend(dados)
+        print()
+    
+    if args.particionado:
+        for dataset, dados in particionados.items():
+            gravar_particionado(dados, args.particionado, dataset, args.ano_padrao)
+
 if __name__ == '__main__':
     main()
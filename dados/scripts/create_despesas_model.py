@@ -2,8 +2,10 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from caminhos import EXCEL_DIR
+
 # Lê o arquivo Excel original
-df_original = pd.read_excel('exemplo_aba_despesas.xlsx')
+df_original = pd.read_excel(EXCEL_DIR / 'exemplo_aba_despesas.xlsx')
 
 print("📊 Criando Excel Modelo Estruturado para Despesas...")
 
@@ -156,7 +158,7 @@ for empresa in empresas:
 df_faturamento = pd.DataFrame(faturamento_dados)
 
 # Criar Excel com múltiplas abas
-with pd.ExcelWriter('despesas_modelo_estruturado.xlsx', engine='openpyxl') as writer:
+with pd.ExcelWriter(EXCEL_DIR / 'despesas_modelo_estruturado.xlsx', engine='openpyxl') as writer:
     # Aba 1: Despesas Detalhadas
     df_modelo.to_excel(writer, sheet_name='Despesas_Detalhadas', index=False)
     
@@ -241,7 +243,7 @@ df_fat_simples.rename(columns={'Faturamento_Bruto': 'Valor'}, inplace=True)
 # Combinar
 df_upload = pd.concat([df_simples, df_fat_simples], ignore_index=True)
 
-with pd.ExcelWriter('despesas_upload_dashboard.xlsx', engine='openpyxl') as writer:
+with pd.ExcelWriter(EXCEL_DIR / 'despesas_upload_dashboard.xlsx', engine='openpyxl') as writer:
     df_upload.to_excel(writer, sheet_name='Dados', index=False)
 
 print(f"\n✅ Excel para upload criado: despesas_upload_dashboard.xlsx")
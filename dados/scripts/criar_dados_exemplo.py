@@ -1,7 +1,10 @@
 import json
 import random
+import sys
 from datetime import datetime, timedelta
 
+from caminhos import DADOS_DIR, PARTICIONADO_DIR
+
 # Seed para reproducibilidade
 random.seed(42)
 
@@ -239,19 +242,19 @@ for empresa in empresas:
 print("✅ Gerando JSON de exemplos...")
 
 # Salvar cash flow
-with open('../cash_flow.json', 'w', encoding='utf-8') as f:
+with open(DADOS_DIR / 'cash_flow.json', 'w', encoding='utf-8') as f:
     json.dump(cash_flow_data, f, ensure_ascii=False, indent=2)
 
 # Salvar indicadores
-with open('../indicadores.json', 'w', encoding='utf-8') as f:
+with open(DADOS_DIR / 'indicadores.json', 'w', encoding='utf-8') as f:
     json.dump(indicadores_data, f, ensure_ascii=False, indent=2)
 
 # Salvar orçamento
-with open('../orcamento.json', 'w', encoding='utf-8') as f:
+with open(DADOS_DIR / 'orcamento.json', 'w', encoding='utf-8') as f:
     json.dump(orcamento_data, f, ensure_ascii=False, indent=2)
 
 # Salvar despesas
-with open('../despesas.json', 'w', encoding='utf-8') as f:
+with open(DADOS_DIR / 'despesas.json', 'w', encoding='utf-8') as f:
     json.dump(despesas_data, f, ensure_ascii=False, indent=2)
 
 print(f"✅ Arquivos JSON gerados com sucesso!")
@@ -259,3 +262,9 @@ print(f"   - Cash Flow: {len(cash_flow_data)} registros")
 print(f"   - Indicadores: {len(indicadores_data)} registros")
 print(f"   - Orçamento: {len(orcamento_data)} registros")
 print(f"   - Despesas: {len(despesas_data)} registros")
+
+# Layout particionado (empresa/ano/mês) para carga seletiva
+if '--particionado' in sys.argv:
+    from particionar_dados import gravar_particionado
+    gravar_particionado(cash_flow_data, PARTICIONADO_DIR, 'cash_flow')
+    gravar_particionado(despesas_data, PARTICIONADO_DIR, 'despesas')
@@ -4,8 +4,10 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils.dataframe import dataframe_to_rows
 
+from caminhos import EXCEL_DIR, SCRIPTS_DIR
+
 def criar_excel_cash_flow():
-    with open('dados_cash_flow_exemplo.json', 'r', encoding='utf-8') as f:
+    with open(SCRIPTS_DIR / 'dados_cash_flow_exemplo.json', 'r', encoding='utf-8') as f:
         data = json.load(f)
     
     df = pd.DataFrame(data)
@@ -54,11 +56,11 @@ def criar_excel_cash_flow():
     ws.column_dimensions['H'].width = 12
     ws.column_dimensions['I'].width = 15
     
-    wb.save('../excel_exemplos/CashFlow_Exemplo.xlsx')
+    wb.save(EXCEL_DIR / 'CashFlow_Exemplo.xlsx')
     print("✅ CashFlow_Exemplo.xlsx criado")
 
 def criar_excel_indicadores():
-    with open('dados_indicadores_exemplo.json', 'r', encoding='utf-8') as f:
+    with open(SCRIPTS_DIR / 'dados_indicadores_exemplo.json', 'r', encoding='utf-8') as f:
         data = json.load(f)
     
     df = pd.DataFrame(data)
@@ -106,11 +108,11 @@ def criar_excel_indicadores():
     for i, header in enumerate(headers, 1):
         ws.column_dimensions[chr(64 + i)].width = 16
     
-    wb.save('../excel_exemplos/Indicadores_Exemplo.xlsx')
+    wb.save(EXCEL_DIR / 'Indicadores_Exemplo.xlsx')
     print("✅ Indicadores_Exemplo.xlsx criado")
 
 def criar_excel_orcamento():
-    with open('dados_orcamento_exemplo.json', 'r', encoding='utf-8') as f:
+    with open(SCRIPTS_DIR / 'dados_orcamento_exemplo.json', 'r', encoding='utf-8') as f:
         data = json.load(f)
     
     df = pd.DataFrame(data)
@@ -157,11 +159,11 @@ def criar_excel_orcamento():
     for i, header in enumerate(headers, 1):
         ws.column_dimensions[chr(64 + i)].width = 15
     
-    wb.save('../excel_exemplos/Orcamento_Exemplo.xlsx')
+    wb.save(EXCEL_DIR / 'Orcamento_Exemplo.xlsx')
     print("✅ Orcamento_Exemplo.xlsx criado")
 
 def criar_excel_despesas():
-    with open('dados_despesas_exemplo.json', 'r', encoding='utf-8') as f:
+    with open(SCRIPTS_DIR / 'dados_despesas_exemplo.json', 'r', encoding='utf-8') as f:
         data = json.load(f)
     
     df = pd.DataFrame(data)
@@ -204,7 +206,7 @@ def criar_excel_despesas():
     ws.column_dimensions['E'].width = 20
     ws.column_dimensions['F'].width = 12
     
-    wb.save('../excel_exemplos/Despesas_Exemplo.xlsx')
+    wb.save(EXCEL_DIR / 'Despesas_Exemplo.xlsx')
     print("✅ Despesas_Exemplo.xlsx criado")
 
 # Gerar os 4 arquivos
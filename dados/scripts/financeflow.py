@@ -0,0 +1,79 @@
+"""Ponto de entrada único para os scripts de dados.
+
+Uso: python dados/scripts/financeflow.py <comando> [argumentos]
+
+Nada pesado é importado aqui: pandas/numpy/openpyxl só carregam quando o
+script do subcomando roda, então comandos rápidos (ajuda, analyze dre sem
+arquivos) sobem em poucos milissegundos. Os caminhos vêm de caminhos.py,
+independente do diretório atual.
+"""
+import runpy
+import sys
+
+# comando (nomes em inglês, como os demais) -> (módulo, descrição)
+COMANDOS = {
+    'generate': ('criar_dados_exemplo', 'Gera os JSON de exemplo em dados/ (--particionado para o layout particionado)'),
+    'excel': ('criar_excels', 'Gera os Excel de exemplo a partir dos JSON'),
+    'model': ('create_despesas_model', 'Gera o Excel modelo estruturado de despesas'),
+    'convert': ('converter_excels_para_json', 'Converte Excel ou CSV/TSV para JSON (aceita arquivos, --paralelo, --particionado)'),
+    'watch': ('monitorar_pasta', 'Reconverte pastas de trabalho e CSVs quando mudam'),
+    'fetch': ('buscar_planilhas', 'Busca exportações CSV de planilhas em paralelo'),
+    'fetch-check': ('servidor_planilhas_local', 'Verifica o fetch contra um servidor HTTP local'),
+    'forecast': ('previsao_fluxo_caixa', 'Projeta o fluxo de caixa dos próximos meses'),
+    'anomalies': ('anomalias_despesas', 'Lista despesas atípicas'),
+    'reconcile': ('conciliar_pagamentos', 'Concilia contas a pagar do fluxo de caixa com as despesas'),
+    'periods': ('agregacao_periodos', 'Totais por mês, trimestre, YTD e móvel 12m com comparação anual'),
+    'versions': ('versionamento_dados', 'Grava/restaura versões de um dataset (snapshots + deltas)'),
+    'ai-summary': ('resumo_ia', 'Resumo estatístico compacto de um dataset para a análise de IA'),
+}
+
+# analyze <alvo> -> módulo
+ANALISES = {
+    'expenses': ('analyze_despesas', 'Estrutura de analise_despesas_exemplo.xlsx'),
+    'expenses-sheets': ('analyze_despesas2', 'Abas de analise_despesas_exemplo.xlsx'),
+    'dre': ('analyze_dre', 'Lista os arquivos DRE disponíveis'),
+    'dashboard': ('analyze_dre2', 'Abas de Dashboard_Financeiro_Exemplo.xlsx'),
+    'example': ('analyze_excel', 'Análise de exemplo_aba_despesas.xlsx'),
+}
+
+
+def _uso():
+    linhas = ['Uso: financeflow.py <comando> [argumentos]', '', 'Comandos:']
+    linhas += [f'  {nome:<12} {descricao}' for nome, (_, descricao) in COMANDOS.items()]
+    linhas += [f'  {"analyze":<12} Análises rápidas: ' + ', '.join(ANALISES)]
+    return '\n'.join(linhas)
+
+
+def _executar(modulo, nome, argumentos):
+    """Roda o módulo como script, com sys.argv próprio"""
+    sys.argv = [f'financeflow.py {nome}', *argumentos]
+    runpy.run_module(modulo, run_name='__main__', alter_sys=True)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print(_uso())
+        return 0
+
+    comando, argumentos = argv[0], argv[1:]
+    if comando == 'analyze':
+        if not argumentos or argumentos[0] not in ANALISES:
+            print('Uso: financeflow.py analyze <alvo>\n\nAlvos:')
+            for alvo, (_, descricao) in ANALISES.items():
+                print(f'  {alvo:<16} {descricao}')
+            return 0 if argumentos[:1] in ([], ['-h'], ['--help']) else 2
+        _executar(ANALISES[argumentos[0]][0], f'analyze {argumentos[0]}', argumentos[1:])
+        return 0
+
+    if comando not in COMANDOS:
+        print(f'Comando desconhecido: {comando}\n')
+        print(_uso())
+        return 2
+
+    _executar(COMANDOS[comando][0], comando, argumentos)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import csv
+import os
+import re
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+EXTENSOES_CSV = {'.csv', '.tsv', '.txt'}
+TAMANHO_AMOSTRA = 64 * 1024
+TAMANHO_BLOCO = 64 * 1024 * 1024
+ENCODINGS = ('utf-8-sig', 'cp1252')
+
+# Colunas conhecidas dos datasets (nome normalizado) -> dtype explícito
+DTYPES_CONHECIDOS = {
+    **dict.fromkeys(['empresa', 'categoria', 'subcategoria', 'tipo', 'status', 'fornecedor',
+                     'responsavel', 'grupo', 'subgrupo', 'centro_custo', 'tipo_conta'], 'category'),
+    **dict.fromkeys(['valor', 'orcado', 'realizado', 'saldo', 'valor_emissao', 'valor_quitacao',
+                     'total_debitos', 'total_creditos', 'faturamento_bruto', 'deducoes',
+                     'faturamento_liquido'], 'float64'),
+    **dict.fromkeys(['ano', 'mes_num'], 'Int16'),
+    **dict.fromkeys(['id', 'data', 'data_vencimento', 'data_lancamento', 'data_emissao', 'descricao',
+                     'conta', 'conta_contabil'], 'string'),
+}
+
+_DECIMAL_VIRGULA = re.compile(r'^-?(\d{1,3}(\.\d{3})+|\d+),\d+$')
+_DECIMAL_PONTO = re.compile(r'^-?(\d{1,3}(,\d{3})+|\d+)\.\d+$')
+_MILHAR_PONTO = re.compile(r'^-?\d{1,3}(\.\d{3})+(,\d+)?$')
+_MILHAR_INTEIRO = re.compile(r'^-?\d{1,3}(\.\d{3})+$')
+
+
+def normalizar_coluna(nome):
+    """'Mês' -> 'mes', 'Data Vencimento' -> 'data_vencimento'"""
+    sem_acento = unicodedata.normalize('NFKD', str(nome)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'\W+', '_', sem_acento.strip().lower()).strip('_')
+
+
+def detectar_formato(arquivo, tamanho_amostra=TAMANHO_AMOSTRA):
+    """Detecta encoding, separador e convenção numérica (1.234,56 vs 1,234.56) pela amostra"""
+    with open(arquivo, 'rb') as f:
+        amostra = f.read(tamanho_amostra)
+
+    for encoding in ENCODINGS:
+        try:
+            texto = amostra.decode(encoding)
+            break
+        except UnicodeDecodeError as e:
+            # A amostra pode cortar um caractere multibyte no final
+            if encoding == 'utf-8-sig' and e.start >= len(amostra) - 3:
+                texto = amostra[:e.start].decode(encoding)
+                break
+    else:
+        encoding, texto = 'latin-1', amostra.decode('latin-1')
+
+    # Só descarta a última linha (possivelmente cortada) se a amostra não cobriu o arquivo todo
+    linhas = texto.splitlines()
+    if len(amostra) == tamanho_amostra:
+        linhas = linhas[:-1] or linhas
+    try:
+        separador = csv.Sniffer().sniff('\n'.join(linhas[:50]), delimiters=';,\t|').delimiter
+    except csv.Error:
+        separador = '\t' if Path(arquivo).suffix.lower() == '.tsv' else ','
+
+    campos = [c.strip().strip('"') for linha in linhas[1:200] for c in linha.split(separador)]
+    # Fora de CSV com vírgula, '1.500' é milhar no padrão brasileiro, não 1,5
+    inteiros_milhar = [separador != ',' and bool(_MILHAR_INTEIRO.match(c)) for c in campos]
+    virgula = sum(bool(_DECIMAL_VIRGULA.match(c)) or m for c, m in zip(campos, inteiros_milhar))
+    ponto = sum(bool(_DECIMAL_PONTO.match(c)) and not m for c, m in zip(campos, inteiros_milhar))
+    decimal = ',' if separador != ',' and virgula > ponto else '.'
+    milhar = '.' if decimal == ',' and any(_MILHAR_PONTO.match(c) for c in campos) else None
+
+    return {'encoding': encoding, 'sep': separador, 'decimal': decimal, 'thousands': milhar}
+
+
+def tipos_colunas(colunas):
+    """dtypes explícitos para as colunas conhecidas; as demais ficam com a inferência do pandas"""
+    return {c: DTYPES_CONHECIDOS[normalizar_coluna(c)] for c in colunas if normalizar_coluna(c) in DTYPES_CONHECIDOS}
+
+
+def _blocos(arquivo, inicio_dados, tamanho_bloco):
+    """Intervalos de bytes alinhados em quebras de linha, a partir do fim do cabeçalho"""
+    tamanho = os.path.getsize(arquivo)
+    limites = [inicio_dados]
+    with open(arquivo, 'rb') as f:
+        posicao = inicio_dados + tamanho_bloco
+        while posicao < tamanho:
+            f.seek(posicao)
+            f.readline()
+            if f.tell() >= tamanho:
+                break
+            limites.append(f.tell())
+            posicao = f.tell() + tamanho_bloco
+    limites.append(tamanho)
+    return list(zip(limites[:-1], limites[1:]))
+
+
+def _ler_bloco(arquivo, inicio, fim, colunas, formato, dtypes):
+    with open(arquivo, 'rb') as f:
+        f.seek(inicio)
+        dados = f.read(fim - inicio)
+    opcoes = dict(header=None, names=colunas, sep=formato['sep'], decimal=formato['decimal'],
+                  thousands=formato['thousands'], encoding=formato['encoding'])
+    try:
+        return pd.read_csv(BytesIO(dados), dtype=dtypes, **opcoes)
+    except (ValueError, TypeError):
+        # Valor fora do padrão numa coluna numérica conhecida: cai para a inferência nela
+        texto = {c: t for c, t in dtypes.items() if t in ('category', 'string')}
+        return pd.read_csv(BytesIO(dados), dtype=texto, **opcoes)
+
+
+def _concatenar(partes):
+    """Concatena blocos unificando as categorias (cada bloco tem as suas)"""
+    if len(partes) == 1:
+        return partes[0]
+    categoricas = [c for c in partes[0].columns
+                   if all(isinstance(p[c].dtype, pd.CategoricalDtype) for p in partes)]
+    unidas = {c: union_categoricals([p[c] for p in partes], ignore_order=True) for c in categoricas}
+    df = pd.concat(partes, ignore_index=True)
+    for coluna, valores in unidas.items():
+        df[coluna] = pd.Categorical(valores)
+    return df
+
+
+def ler_csv(arquivo, paralelo=None, threads=None, tamanho_bloco=TAMANHO_BLOCO):
+    """Lê um CSV/TSV exportado de ERP para DataFrame.
+
+    Separador, encoding e convenção numérica são detectados pela amostra e as
+    colunas conhecidas recebem dtype explícito (categorias para textos
+    repetidos). Arquivos maiores que um bloco são divididos em intervalos de
+    bytes alinhados em quebras de linha e lidos em threads (o parser C do
+    pandas libera o GIL durante a tokenização). paralelo=None decide pelo
+    tamanho; a divisão assume que campos entre aspas não contêm quebras de
+    linha, então use paralelo=False se for o caso.
+    """
+    arquivo = Path(arquivo)
+    formato = detectar_formato(arquivo)
+    with open(arquivo, 'rb') as f:
+        cabecalho = f.readline()
+        inicio_dados = f.tell()
+    colunas = next(csv.reader([cabecalho.decode(formato['encoding']).strip('\r\n')], delimiter=formato['sep']))
+    dtypes = tipos_colunas(colunas)
+
+    if paralelo is None:
+        paralelo = os.path.getsize(arquivo) > tamanho_bloco
+    blocos = _blocos(arquivo, inicio_dados, tamanho_bloco) if paralelo else [(inicio_dados, os.path.getsize(arquivo))]
+
+    if len(blocos) == 1:
+        partes = [_ler_bloco(arquivo, *blocos[0], colunas, formato, dtypes)]
+    else:
+        with ThreadPoolExecutor(max_workers=threads or os.cpu_count()) as executor:
+            partes = list(executor.map(lambda b: _ler_bloco(arquivo, *b, colunas, formato, dtypes), blocos))
+    return _concatenar(partes)
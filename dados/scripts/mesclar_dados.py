@@ -0,0 +1,230 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+# Campos que identificam um lançamento (chave estável, sem o valor)
+CAMPOS_CHAVE = ('empresa', 'ano', 'mes', 'categoria', 'subcategoria', 'data', 'fornecedor')
+
+# Campos que compõem o hash de conteúdo (uma correção de valor vira atualização)
+CAMPOS_CONTEUDO = ('empresa', 'ano', 'mes', 'categoria', 'subcategoria', 'data', 'valor', 'fornecedor')
+
+# Campos de data de onde o ano é extraído quando o registro não tem 'ano'
+CAMPOS_DATA = ('data', 'data_lancamento', 'data_vencimento', 'Data')
+
+
+def ano_registro(registro):
+    """Ano do registro: campo 'ano' ou o ano da primeira data reconhecida; 0 se não houver"""
+    if registro.get('ano'):
+        return int(registro['ano'])
+    for campo in CAMPOS_DATA:
+        encontrado = re.search(r'\b(\d{4})\b', str(registro.get(campo) or ''))
+        if encontrado:
+            return int(encontrado.group(1))
+    return 0
+
+
+def _campo(registro, campo):
+    """Lê um campo normalizado; 'data' aceita data_lancamento/data_vencimento e 'ano' sai da data"""
+    if campo == 'ano':
+        valor = ano_registro(registro) or ''
+    elif campo == 'data':
+        valor = registro.get('data') or registro.get('data_lancamento') or registro.get('data_vencimento', '')
+    else:
+        valor = registro.get(campo, '')
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    return str(valor).strip()
+
+
+def _digest(partes):
+    return hashlib.sha1('\x1f'.join(partes).encode('utf-8')).hexdigest()
+
+
+def hash_conteudo(registro, campos=CAMPOS_CONTEUDO):
+    """Hash do conteúdo relevante de um registro"""
+    return _digest([_campo(registro, c) for c in campos])
+
+
+def chaves_estaveis(registros, campos=CAMPOS_CHAVE):
+    """Gera uma chave estável por registro.
+
+    Lançamentos com a mesma chave natural (ex.: duas notas do mesmo fornecedor
+    no mesmo dia) são diferenciados pela ordem de ocorrência dentro do grupo,
+    e não pela posição na planilha inteira.
+    """
+    ocorrencias = {}
+    chaves = []
+    for registro in registros:
+        base = _digest([_campo(registro, c) for c in campos])
+        n = ocorrencias.get(base, 0)
+        ocorrencias[base] = n + 1
+        chaves.append(f"{base[:16]}_{n}")
+    return chaves
+
+
+def _grupos(registros, campos_chave, campos_conteudo):
+    """{chave natural: [(chave, hash, registro), ...]} na ordem de ocorrência"""
+    grupos = {}
+    for chave, registro in zip(chaves_estaveis(registros, campos_chave), registros):
+        base = chave.rsplit('_', 1)[0]
+        grupos.setdefault(base, []).append((chave, hash_conteudo(registro, campos_conteudo), registro))
+    return grupos
+
+
+def calcular_mesclagem(existentes, novos, campos_chave=CAMPOS_CHAVE, campos_conteudo=CAMPOS_CONTEUDO):
+    """Compara os dados existentes com um novo upload.
+
+    Retorna um dict com as listas 'inserir', 'atualizar' e 'remover'
+    (pares (chave, registro)) e a contagem de registros 'inalterados'.
+    Dentro de um grupo com a mesma chave natural, as linhas novas casam
+    primeiro com as existentes de conteúdo idêntico; só as que sobram são
+    pareadas pela ordem de ocorrência (correções viram atualizações). Assim,
+    apagar uma linha do grupo remove só ela, sem deslocar as demais.
+    Remoções só acontecem dentro dos períodos empresa/ano/mês presentes no
+    novo upload, para que um arquivo parcial não apague os demais meses.
+    """
+    grupos_existentes = _grupos(existentes, campos_chave, campos_conteudo)
+    grupos_novos = _grupos(novos, campos_chave, campos_conteudo)
+
+    resultado = {'inserir': [], 'atualizar': [], 'remover': [], 'inalterados': 0}
+    periodos = {(_campo(r, 'empresa'), _campo(r, 'ano'), _campo(r, 'mes')) for r in novos}
+    sobras = []
+
+    for base, linhas in grupos_novos.items():
+        atuais = grupos_existentes.get(base, [])
+        por_hash = {}
+        for i, (_, hash_atual, _) in enumerate(atuais):
+            por_hash.setdefault(hash_atual, []).append(i)
+
+        casados = set()
+        pendentes = []
+        for _, hash_novo, registro in linhas:
+            if por_hash.get(hash_novo):
+                casados.add(por_hash[hash_novo].pop(0))
+                resultado['inalterados'] += 1
+            else:
+                pendentes.append(registro)
+
+        livres = [i for i in range(len(atuais)) if i not in casados]
+        for i, registro in zip(livres, pendentes):
+            resultado['atualizar'].append((atuais[i][0], registro))
+        for n, registro in enumerate(pendentes[len(livres):], start=len(atuais)):
+            resultado['inserir'].append((f"{base}_{n}", registro))
+        sobras.extend(atuais[i] for i in livres[len(pendentes):])
+
+    for base, atuais in grupos_existentes.items():
+        if base not in grupos_novos:
+            sobras.extend(atuais)
+
+    for chave, _, registro in sobras:
+        if (_campo(registro, 'empresa'), _campo(registro, 'ano'), _campo(registro, 'mes')) in periodos:
+            resultado['remover'].append((chave, registro))
+
+    return resultado
+
+
+def _id_livre(id_registro, usados):
+    """Próximo id '<base>_<n>' que ainda não está em uso"""
+    base, _, n = str(id_registro).rpartition('_')
+    if not base or not n.isdigit():
+        base, n = str(id_registro), '0'
+    n = int(n)
+    while f"{base}_{n}" in usados:
+        n += 1
+    return f"{base}_{n}"
+
+
+def aplicar_mesclagem(existentes, mesclagem, campos_chave=CAMPOS_CHAVE):
+    """Aplica inserções, atualizações e remoções preservando a ordem existente.
+
+    Registros atualizados mantêm o 'id' já gravado, e um inserido cujo 'id'
+    coincida com um existente recebe o próximo sufixo livre.
+    """
+    alteracoes = dict(mesclagem['atualizar'])
+    removidos = {chave for chave, _ in mesclagem['remover']}
+
+    resultado = []
+    for chave, registro in zip(chaves_estaveis(existentes, campos_chave), existentes):
+        if chave in removidos:
+            continue
+        novo = alteracoes.get(chave, registro)
+        if novo is not registro and 'id' in registro and 'id' in novo:
+            novo = {**novo, 'id': registro['id']}
+        resultado.append(novo)
+
+    usados = {r['id'] for r in resultado if 'id' in r}
+    for _, registro in mesclagem['inserir']:
+        if 'id' in registro and registro['id'] in usados:
+            registro = {**registro, 'id': _id_livre(registro['id'], usados)}
+        usados.add(registro.get('id'))
+        resultado.append(registro)
+    return resultado
+
+
+def _ler_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Lida uma vez no import: trocar a umask do processo a cada gravação disputaria com outras threads
+MODO_ARQUIVO = 0o666 & ~_ler_umask()
+
+
+def _sincronizar_pasta(pasta):
+    """Persiste a renomeação no disco (fsync da pasta; não suportado no Windows)"""
+    try:
+        fd = os.open(pasta, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def gravar_json_atomico(arquivo, dados):
+    """Grava o JSON em um temporário na mesma pasta e renomeia por cima do destino.
+
+    O mkstemp cria o temporário com modo 0600; as permissões passam a
+    MODO_ARQUIVO antes da troca para que o arquivo final fique legível como
+    os demais de dados/. O conteúdo é enviado ao disco (fsync) antes da
+    renomeação, para que uma queda de energia não deixe um arquivo vazio.
+    """
+    arquivo = Path(arquivo)
+    fd, temporario = tempfile.mkstemp(dir=arquivo.parent, prefix=f'.{arquivo.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temporario, MODO_ARQUIVO)
+        os.replace(temporario, arquivo)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+    _sincronizar_pasta(arquivo.parent)
+
+
+def mesclar_arquivo_json(arquivo, novos, campos_chave=CAMPOS_CHAVE, campos_conteudo=CAMPOS_CONTEUDO):
+    """Mescla novos registros em um arquivo JSON, gravando só se houver mudanças"""
+    arquivo = Path(arquivo)
+    existentes = []
+    if arquivo.exists():
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            existentes = json.load(f)
+
+    mesclagem = calcular_mesclagem(existentes, novos, campos_chave, campos_conteudo)
+    alterados = len(mesclagem['inserir']) + len(mesclagem['atualizar']) + len(mesclagem['remover'])
+
+    if alterados or not arquivo.exists():
+        gravar_json_atomico(arquivo, aplicar_mesclagem(existentes, mesclagem, campos_chave))
+
+    print(f"   Inseridos: {len(mesclagem['inserir'])} | Atualizados: {len(mesclagem['atualizar'])} | "
+          f"Removidos: {len(mesclagem['remover'])} | Inalterados: {mesclagem['inalterados']}")
+    return mesclagem
@@ -0,0 +1,181 @@
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+# Importados uma vez: o processo fica "quente" e cada conversão não paga o custo de import
+import openpyxl  # noqa: F401
+import pandas as pd  # noqa: F401
+
+from converter_excels_para_json import BASE_DIR, converter_arquivo, salvar_datasets
+from ingestao_csv import EXTENSOES_CSV
+
+EXTENSOES = {'.xlsx'} | EXTENSOES_CSV
+ATRASO_PADRAO = 1.0
+INTERVALO_POLLING = 1.0
+
+# Constantes de <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+EVENTO = struct.Struct('iIII')
+
+
+class MonitorInotify:
+    """Eventos de arquivo via inotify (Linux), sem dependências externas"""
+
+    def __init__(self, pasta):
+        self.pasta = Path(pasta)
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 falhou')
+        mascara = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        if self._libc.inotify_add_watch(self._fd, os.fsencode(self.pasta), mascara) < 0:
+            erro = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(erro, f'inotify_add_watch falhou em {self.pasta}')
+
+    def aguardar(self, timeout=None):
+        """Bloqueia até haver eventos (ou o timeout) e devolve os caminhos alterados"""
+        prontos, _, _ = select.select([self._fd], [], [], timeout)
+        if not prontos:
+            return set()
+
+        alterados = set()
+        buffer = os.read(self._fd, 64 * 1024)
+        posicao = 0
+        while posicao < len(buffer):
+            _, _, _, tamanho = EVENTO.unpack_from(buffer, posicao)
+            posicao += EVENTO.size
+            nome = buffer[posicao:posicao + tamanho].rstrip(b'\0')
+            posicao += tamanho
+            if nome:
+                alterados.add(self.pasta / os.fsdecode(nome))
+        return alterados
+
+    def fechar(self):
+        os.close(self._fd)
+
+
+class MonitorPolling:
+    """Alternativa portátil: compara mtime/tamanho dos arquivos a cada intervalo"""
+
+    def __init__(self, pasta, intervalo=INTERVALO_POLLING):
+        self.pasta = Path(pasta)
+        self.intervalo = intervalo
+        self._estado = self._varrer()
+
+    def _varrer(self):
+        estado = {}
+        with os.scandir(self.pasta) as entradas:
+            for entrada in entradas:
+                if entrada.is_file():
+                    info = entrada.stat()
+                    estado[Path(entrada.path)] = (info.st_mtime_ns, info.st_size)
+        return estado
+
+    def aguardar(self, timeout=None):
+        time.sleep(self.intervalo if timeout is None else min(self.intervalo, timeout))
+        atual = self._varrer()
+        alterados = {p for p in atual.keys() | self._estado.keys() if atual.get(p) != self._estado.get(p)}
+        self._estado = atual
+        return alterados
+
+    def fechar(self):
+        pass
+
+
+def criar_monitor(pasta, polling=False, intervalo=INTERVALO_POLLING):
+    """inotify quando disponível; polling caso contrário ou se solicitado"""
+    if not polling:
+        try:
+            return MonitorInotify(pasta)
+        except (OSError, AttributeError, TypeError):
+            print("⚠️  inotify indisponível, usando polling")
+    return MonitorPolling(pasta, intervalo)
+
+
+def _assinatura(arquivo):
+    try:
+        info = arquivo.stat()
+    except FileNotFoundError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+
+def _relevante(arquivo):
+    return arquivo.suffix.lower() in EXTENSOES and not arquivo.name.startswith(('~$', '.'))
+
+
+def reconverter(arquivo):
+    """Converte uma pasta de trabalho ou CSV e grava as saídas (gravação atômica)"""
+    print(f"🔄 {arquivo.name} alterado, convertendo...")
+    inicio = time.perf_counter()
+    try:
+        salvar_datasets(arquivo, converter_arquivo(arquivo))
+    except Exception as e:
+        # Arquivo possivelmente ainda sendo gravado; um novo evento dispara outra tentativa
+        print(f"❌ Erro ao converter {arquivo.name}: {e}")
+        return False
+    print(f"   Concluído em {time.perf_counter() - inicio:.2f}s")
+    return True
+
+
+def monitorar(pasta=BASE_DIR, atraso=ATRASO_PADRAO, polling=False, intervalo=INTERVALO_POLLING):
+    """Fica observando a pasta e reconverte só os arquivos alterados.
+
+    Eventos do mesmo arquivo são agrupados até 'atraso' segundos sem novas
+    alterações (debounce), e arquivos cuja assinatura mtime/tamanho não mudou
+    desde a última conversão são ignorados.
+    """
+    pasta = Path(pasta)
+    monitor = criar_monitor(pasta, polling, intervalo)
+    convertidos = {p: _assinatura(p) for p in pasta.iterdir() if _relevante(p)}
+    pendentes = {}
+
+    print(f"👀 Monitorando {pasta} ({type(monitor).__name__}), Ctrl+C para sair")
+    try:
+        while True:
+            agora = time.monotonic()
+            timeout = min(pendentes.values()) + atraso - agora if pendentes else None
+            for arquivo in monitor.aguardar(None if timeout is None else max(timeout, 0)):
+                if _relevante(arquivo):
+                    pendentes[arquivo] = time.monotonic()
+
+            agora = time.monotonic()
+            for arquivo in [p for p, t in pendentes.items() if agora - t >= atraso]:
+                del pendentes[arquivo]
+                assinatura = _assinatura(arquivo)
+                if assinatura is None or convertidos.get(arquivo) == assinatura:
+                    continue
+                if reconverter(arquivo):
+                    convertidos[arquivo] = assinatura
+    except KeyboardInterrupt:
+        print("\nMonitoramento encerrado")
+    finally:
+        monitor.fechar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reconverte pastas de trabalho Excel e CSV/TSV quando mudam')
+    parser.add_argument('pasta', nargs='?', type=Path, default=BASE_DIR, help='Pasta observada')
+    parser.add_argument('--atraso', type=float, default=ATRASO_PADRAO,
+                        help='Segundos sem novos eventos antes de converter')
+    parser.add_argument('--polling', action='store_true', help='Força o modo polling (sem inotify)')
+    parser.add_argument('--intervalo', type=float, default=INTERVALO_POLLING,
+                        help='Intervalo do polling em segundos')
+    args = parser.parse_args()
+
+    monitorar(args.pasta, args.atraso, args.polling, args.intervalo)
+
+
+if __name__ == '__main__':
+    main()
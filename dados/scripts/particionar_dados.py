@@ -0,0 +1,134 @@
+import json
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from mesclar_dados import CAMPOS_DATA, ano_registro, gravar_json_atomico
+
+# Layout: <destino>/<dataset>/empresa=X/ano=Y/mes=Z/dados.json
+ARQUIVO_PARTICAO = 'dados.json'
+ARQUIVO_MANIFESTO = '_manifesto.json'
+
+MESES = ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho',
+         'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro']
+
+
+def _mes_data(registro):
+    """Mês da primeira data reconhecida (dd/mm/aaaa ou aaaa-mm-dd); 0 se não houver"""
+    for campo in CAMPOS_DATA:
+        texto = str(registro.get(campo) or '')
+        encontrado = re.search(r'\b\d{4}-(\d{1,2})-\d{1,2}', texto) or re.search(r'\b\d{1,2}/(\d{1,2})/\d{4}', texto)
+        if encontrado:
+            return int(encontrado.group(1))
+    return 0
+
+
+def _mes(registro):
+    """Mês como número: 'mes_num', 'mes' numérico, nome do mês ou a data; 0 se não reconhecido"""
+    valor = registro.get('mes_num') or registro.get('mes')
+    if not valor:
+        return _mes_data(registro)
+    if isinstance(valor, str):
+        nome = valor.strip().lower()
+        if nome in MESES:
+            return MESES.index(nome) + 1
+        return int(nome) if nome.isdigit() else 0
+    return int(valor or 0)
+
+
+def chave_particao(registro):
+    """(empresa, ano, mes) de um registro; ano ou mês não reconhecido vira 0"""
+    return (str(registro.get('empresa', '')), ano_registro(registro), _mes(registro))
+
+
+def caminho_particao(empresa, ano, mes):
+    return Path(f"empresa={quote(empresa, safe=' ')}") / f"ano={ano}" / f"mes={mes}"
+
+
+def gravar_particionado(registros, destino, dataset, ano_padrao=None):
+    """Grava um dataset particionado por empresa/ano/mês com um manifesto.
+
+    O manifesto guarda, por partição, o caminho relativo, a quantidade de
+    registros e o total de 'valor', para que consumidores escolham o que ler
+    sem abrir os dados. Só as partições presentes em 'registros' são
+    substituídas; as demais (outras empresas/meses) e suas entradas no
+    manifesto são mantidas. Cada arquivo é gravado de forma atômica.
+
+    Registros sem ano (nem campo 'ano' nem data) recebem 'ano_padrao'; sem
+    ele, ficam de fora com um aviso, em vez de irem para uma partição ano=0
+    que nenhum filtro por ano alcança.
+    """
+    pasta = Path(destino) / dataset
+    manifesto = {}
+    if (pasta / ARQUIVO_MANIFESTO).exists():
+        manifesto = {(p['empresa'], p['ano'], p['mes']): p for p in ler_manifesto(destino, dataset)}
+
+    particoes = {}
+    sem_ano = 0
+    for registro in registros:
+        empresa, ano, mes = chave_particao(registro)
+        if not ano:
+            if ano_padrao is None:
+                sem_ano += 1
+                continue
+            ano = ano_padrao
+        particoes.setdefault((empresa, ano, mes), []).append(registro)
+    if sem_ano:
+        print(f"⚠️  {dataset}: {sem_ano} registros sem ano ignorados (informe ano_padrao)")
+
+    for (empresa, ano, mes), dados in particoes.items():
+        relativo = caminho_particao(empresa, ano, mes)
+        (pasta / relativo).mkdir(parents=True, exist_ok=True)
+        gravar_json_atomico(pasta / relativo / ARQUIVO_PARTICAO, dados)
+
+        manifesto[(empresa, ano, mes)] = {
+            'empresa': empresa,
+            'ano': ano,
+            'mes': mes,
+            'caminho': relativo.as_posix(),
+            'registros': len(dados),
+            'total_valor': round(sum(float(r.get('valor') or 0) for r in dados), 2)
+        }
+
+    manifesto = [manifesto[chave] for chave in sorted(manifesto)]
+    pasta.mkdir(parents=True, exist_ok=True)
+    gravar_json_atomico(pasta / ARQUIVO_MANIFESTO, {'dataset': dataset, 'particoes': manifesto})
+
+    print(f"✅ {dataset}: {len(registros) - sem_ano} registros em {len(particoes)} partições")
+    print(f"   Salvo em: {pasta}")
+    return manifesto
+
+
+def ler_manifesto(destino, dataset):
+    with open(Path(destino) / dataset / ARQUIVO_MANIFESTO, 'r', encoding='utf-8') as f:
+        return json.load(f)['particoes']
+
+
+def _filtrar(manifesto, empresas=None, anos=None, meses=None):
+    return [
+        p for p in manifesto
+        if (empresas is None or p['empresa'] in empresas)
+        and (anos is None or p['ano'] in anos)
+        and (meses is None or p['mes'] in meses)
+    ]
+
+
+def carregar_particionado(destino, dataset, empresas=None, anos=None, meses=None):
+    """Carrega só as partições que batem com o filtro (None = sem filtro)"""
+    pasta = Path(destino) / dataset
+    registros = []
+    for particao in _filtrar(ler_manifesto(destino, dataset), empresas, anos, meses):
+        with open(pasta / particao['caminho'] / ARQUIVO_PARTICAO, 'r', encoding='utf-8') as f:
+            registros.extend(json.load(f))
+    return registros
+
+
+def resumo_particionado(destino, dataset, empresas=None, anos=None, meses=None):
+    """Totais de registros e valor a partir do manifesto, sem ler as partições"""
+    selecionadas = _filtrar(ler_manifesto(destino, dataset), empresas, anos, meses)
+    return {
+        'particoes': len(selecionadas),
+        'registros': sum(p['registros'] for p in selecionadas),
+        'total_valor': round(sum(p['total_valor'] for p in selecionadas), 2)
+    }
+
@@ -0,0 +1,129 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from caminhos import DADOS_DIR
+from particionar_dados import chave_particao
+
+# Grade de parâmetros avaliada de uma vez para todas as séries
+ALPHAS = (0.1, 0.2, 0.3, 0.5, 0.7, 0.9)
+BETAS = (0.0, 0.1, 0.3)
+AMORTECIMENTO = 0.9
+PERIODO_SAZONAL = 12
+
+
+def matriz_series(registros):
+    """Monta a matriz séries x meses (empresa, tipo, categoria) com os valores somados.
+
+    Meses sem lançamento entram como zero, para que todas as séries tenham o
+    mesmo eixo de tempo. Lançamentos sem ano ou mês legível ficam de fora
+    (com aviso): um período 0000-MM esticaria o eixo e diluiria a sazonalidade.
+    """
+    linhas = []
+    sem_data = 0
+    for registro in registros:
+        empresa, ano, mes = chave_particao(registro)
+        if not ano or not 1 <= mes <= 12:
+            sem_data += 1
+            continue
+        linhas.append((empresa, registro.get('tipo', ''), registro.get('categoria', ''),
+                       pd.Period(year=ano, month=mes, freq='M'), float(registro.get('valor') or 0)))
+
+    if sem_data:
+        print(f"⚠️  {sem_data} lançamentos sem data ignorados na previsão")
+
+    df = pd.DataFrame(linhas, columns=['empresa', 'tipo', 'categoria', 'periodo', 'valor'])
+    matriz = df.pivot_table(index=['empresa', 'tipo', 'categoria'], columns='periodo',
+                            values='valor', aggfunc='sum', fill_value=0.0)
+    meses = pd.period_range(matriz.columns.min(), matriz.columns.max(), freq='M')
+    return matriz.reindex(columns=meses, fill_value=0.0)
+
+
+def _indices_sazonais(Y, periodo):
+    """Índices sazonais aditivos por série (zeros se não houver dois ciclos completos)"""
+    n, t = Y.shape
+    if t < 2 * periodo:
+        return np.zeros((n, periodo))
+    ciclos = t // periodo
+    recorte = Y[:, t - ciclos * periodo:].reshape(n, ciclos, periodo)
+    sazonal = recorte.mean(axis=1)
+    return sazonal - sazonal.mean(axis=1, keepdims=True)
+
+
+def prever_series(Y, horizonte, periodo=PERIODO_SAZONAL, alphas=ALPHAS, betas=BETAS, phi=AMORTECIMENTO):
+    """Holt amortecido com sazonalidade aditiva, ajustado em lote.
+
+    Y tem forma (séries, meses). A recursão percorre apenas o eixo do tempo;
+    séries e combinações (alpha, beta) da grade são processadas juntas como
+    arrays. Cada série fica com a combinação de menor erro um passo à frente.
+    Retorna um array (séries, horizonte).
+    """
+    Y = np.asarray(Y, dtype=float)
+    n, t = Y.shape
+    sazonal = _indices_sazonais(Y, periodo)
+    fase = (np.arange(t) - t) % periodo
+    X = Y - sazonal[:, fase]
+
+    grade_a, grade_b = np.meshgrid(alphas, betas, indexing='ij')
+    a = grade_a.reshape(-1, 1)
+    b = grade_b.reshape(-1, 1)
+
+    nivel = np.broadcast_to(X[:, 0], (a.shape[0], n)).copy()
+    tendencia = np.broadcast_to(X[:, 1] - X[:, 0] if t > 1 else np.zeros(n), (a.shape[0], n)).copy()
+    erro = np.zeros_like(nivel)
+    for i in range(1, t):
+        previsto = nivel + phi * tendencia
+        erro += (X[:, i] - previsto) ** 2
+        novo_nivel = a * X[:, i] + (1 - a) * previsto
+        tendencia = b * (novo_nivel - nivel) + (1 - b) * phi * tendencia
+        nivel = novo_nivel
+
+    melhor = erro.argmin(axis=0)
+    colunas = np.arange(n)
+    nivel = nivel[melhor, colunas]
+    tendencia = tendencia[melhor, colunas]
+
+    passos = np.cumsum(phi ** np.arange(1, horizonte + 1))
+    previsao = nivel[:, None] + tendencia[:, None] * passos[None, :]
+    previsao += sazonal[:, np.arange(horizonte) % periodo]
+    return np.clip(previsao, 0, None)
+
+
+def prever_fluxo_caixa(registros, horizonte=3):
+    """Projeta entradas (Receber), saídas (Pagar) e saldo por empresa e mês.
+
+    Retorna (series, consolidado): a projeção de cada série
+    empresa x tipo x categoria e o consolidado mensal por empresa.
+    """
+    matriz = matriz_series(registros)
+    previsao = prever_series(matriz.to_numpy(), horizonte)
+    meses = pd.period_range(matriz.columns[-1] + 1, periods=horizonte, freq='M')
+    series = pd.DataFrame(previsao, index=matriz.index, columns=meses)
+
+    por_tipo = series.groupby(level=['empresa', 'tipo']).sum().stack().unstack('tipo', fill_value=0.0)
+    consolidado = pd.DataFrame({
+        'entradas': por_tipo.get('Receber', 0.0),
+        'saidas': por_tipo.get('Pagar', 0.0),
+    }, index=por_tipo.index)
+    consolidado['saldo'] = consolidado['entradas'] - consolidado['saidas']
+    consolidado.index.names = ['empresa', 'periodo']
+    return series, consolidado.round(2)
+
+
+def main():
+    with open(DADOS_DIR / 'cash_flow.json', 'r', encoding='utf-8') as f:
+        registros = json.load(f)
+
+    series, consolidado = prever_fluxo_caixa(registros, horizonte=3)
+
+    print("=" * 60)
+    print("PREVISÃO DE FLUXO DE CAIXA")
+    print("=" * 60)
+    print(f"Séries projetadas: {len(series)}")
+    print()
+    print(consolidado.to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+import argparse
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from caminhos import DADOS_DIR
+from ingestao_csv import normalizar_coluna
+from mesclar_dados import CAMPOS_DATA, gravar_json_atomico
+from particionar_dados import chave_particao
+
+TOP_K = 5
+MESES_RESUMO = 12
+PERCENTIS = (10, 25, 50, 75, 90)
+LIMIAR_OUTLIER = 3.5
+LIMITE_CACHE = 64
+
+# AnalysisType (utils/dashboardAIAnalysis.ts) -> colunas usadas no resumo
+CONFIG_TIPOS = {
+    'despesas': {'valor': 'valor', 'categoria': 'categoria'},
+    'dre': {'valor': 'valor', 'categoria': 'categoria'},
+    'fluxo_caixa': {'valor': 'valor', 'categoria': 'categoria', 'tipo': 'tipo'},
+    'balancete': {'valor': 'saldo', 'categoria': 'grupo'},
+    'orcamento': {'valor': 'realizado', 'categoria': 'categoria', 'orcado': 'orcado'},
+    'indicadores': {},
+}
+
+# Dataset em dados/ usado pela linha de comando para cada tipo (os demais exigem --arquivo)
+ARQUIVOS_TIPOS = {
+    'despesas': 'despesas.json',
+    'fluxo_caixa': 'cash_flow.json',
+    'balancete': 'balancete.json',
+    'orcamento': 'orcamento.json',
+    'indicadores': 'indicadores.json',
+}
+
+# Colunas lidas pelo resumo; chegam também como 'Mes', 'Valor', 'Empresa' (DRE, planilhas)
+CAMPOS_RESUMO = {'empresa', 'ano', 'mes', 'mes_num', 'valor', 'categoria', 'tipo', 'saldo', 'grupo',
+                 'orcado', 'realizado', *CAMPOS_DATA}
+
+_cache = OrderedDict()
+
+
+def impressao_digital(tipo, registros, top_k=TOP_K):
+    """Hash estável do dataset e dos parâmetros do resumo (lê o dataset inteiro)"""
+    conteudo = json.dumps([tipo, top_k, registros], ensure_ascii=False, default=str)
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+
+
+def impressao_arquivo(arquivo):
+    """Impressão barata de um dataset em disco: caminho, mtime e tamanho, sem ler o conteúdo"""
+    info = Path(arquivo).stat()
+    return f'{Path(arquivo).resolve()}:{info.st_mtime_ns}:{info.st_size}'
+
+
+def _periodo(df):
+    """Série AAAAMM com a mesma leitura de ano/mês do particionamento (nomes de mês, datas)"""
+    campos = [c for c in ('ano', 'mes', 'mes_num', *CAMPOS_DATA) if c in df]
+    linhas = df[campos].astype(object).where(df[campos].notna(), None).to_dict('records')
+    return pd.Series([ano * 100 + mes for _, ano, mes in map(chave_particao, linhas)], index=df.index)
+
+
+def _numero(serie):
+    """Valores numéricos, aceitando texto em reais ('R$ 381.305,69')"""
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie
+    texto = serie.astype(str).str.replace(r'R\$|\s', '', regex=True)
+    brasileiro = texto.str.contains(',', regex=False)
+    texto = texto.where(~brasileiro, texto.str.replace('.', '', regex=False).str.replace(',', '.', regex=False))
+    return pd.to_numeric(texto, errors='coerce')
+
+
+def _arredondar(valor):
+    return None if pd.isna(valor) else round(float(valor), 2)
+
+
+def _top(serie, top_k):
+    """Maiores itens em valor absoluto (saldos podem ser negativos) com participação no total"""
+    absoluto = serie.abs()
+    total = absoluto.sum()
+    return [
+        {'nome': str(nome), 'total': _arredondar(serie[nome]),
+         'participacao_pct': _arredondar(absoluto[nome] / total * 100) if total else None}
+        for nome in absoluto.nlargest(top_k).index
+    ]
+
+
+def _mensal(serie):
+    """Totais dos últimos meses com variação contra o mês anterior"""
+    serie = serie.sort_index().tail(MESES_RESUMO + 1)
+    variacao = serie.pct_change() * 100
+    return [
+        {'periodo': f'{p // 100}-{p % 100:02d}' if p >= 100 else str(p), 'total': _arredondar(v),
+         'variacao_pct': _arredondar(variacao[p]) if np.isfinite(variacao[p]) else None}
+        for p, v in serie.tail(MESES_RESUMO).items()
+    ]
+
+
+def _outliers(df, coluna_valor, coluna_categoria, top_k):
+    """Maiores desvios robustos (mediana/MAD) por categoria, sem identificar transações"""
+    grupos = df.groupby(coluna_categoria, observed=True)[coluna_valor]
+    mediana = grupos.transform('median')
+    mad = (df[coluna_valor] - mediana).abs().groupby(df[coluna_categoria], observed=True).transform('median')
+    score = 0.6745 * (df[coluna_valor] - mediana) / mad.replace(0, np.nan)
+    sinalizados = score[score.abs() >= LIMIAR_OUTLIER]
+    maiores = sinalizados.abs().nlargest(top_k).index
+    return {
+        'quantidade': int(len(sinalizados)),
+        'maiores': [
+            {'categoria': str(df.at[i, coluna_categoria]), 'periodo': int(df.at[i, '_periodo']),
+             'valor': _arredondar(df.at[i, coluna_valor]), 'mediana_categoria': _arredondar(mediana[i]),
+             'score': _arredondar(score[i])}
+            for i in maiores
+        ],
+    }
+
+
+def _resumo_indicadores(df, top_k):
+    metricas = [c for c in df.select_dtypes('number').columns if c not in ('mes', 'ano', '_periodo')]
+    ultimo = df['_periodo'].max()
+    primeiro = df['_periodo'].min()
+    media_ultimo = df.loc[df['_periodo'] == ultimo, metricas].mean()
+    media_primeiro = df.loc[df['_periodo'] == primeiro, metricas].mean()
+    descricao = df[metricas].describe(percentiles=[0.5]).T
+    return {
+        'metricas': {
+            m: {'media': _arredondar(descricao.at[m, 'mean']), 'mediana': _arredondar(descricao.at[m, '50%']),
+                'min': _arredondar(descricao.at[m, 'min']), 'max': _arredondar(descricao.at[m, 'max']),
+                'ultimo_periodo': _arredondar(media_ultimo[m]),
+                'variacao_periodo': _arredondar(media_ultimo[m] - media_primeiro[m])}
+            for m in metricas
+        },
+        'empresas': df['empresa'].astype(str).value_counts().head(top_k).index.tolist() if 'empresa' in df else [],
+    }
+
+
+def _construir(tipo, registros, top_k):
+    df = pd.DataFrame(registros)
+    resumo = {'tipo': tipo, 'registros': len(df)}
+    if df.empty:
+        return resumo
+    normalizadas = {c: normalizar_coluna(c) for c in df.columns}
+    df = df.rename(columns={c: n for c, n in normalizadas.items()
+                            if n in CAMPOS_RESUMO and n != c and n not in df.columns})
+    df['_periodo'] = _periodo(df)
+    if tipo == 'indicadores':
+        resumo.update(_resumo_indicadores(df, top_k))
+        return resumo
+
+    config = CONFIG_TIPOS[tipo]
+    valor, categoria = config['valor'], config['categoria']
+    df[valor] = _numero(df[valor]).fillna(0.0)
+    df[categoria] = df[categoria].fillna('').astype(str).astype('category')
+
+    resumo['total'] = _arredondar(df[valor].sum())
+    resumo['percentis'] = dict(zip((f'p{p}' for p in PERCENTIS),
+                                   map(_arredondar, np.percentile(df[valor], PERCENTIS))))
+    resumo['top_categorias'] = _top(df.groupby(categoria, observed=True)[valor].sum(), top_k)
+    if 'empresa' in df:
+        resumo['top_empresas'] = _top(df.groupby('empresa')[valor].sum(), top_k)
+
+    if 'tipo' in config:
+        sinal = np.where(df[config['tipo']] == 'Pagar', -1.0, 1.0)
+        por_tipo = df.pivot_table(index='_periodo', columns=config['tipo'], values=valor, aggfunc='sum',
+                                  fill_value=0.0)
+        resumo['entradas_mensais'] = _mensal(por_tipo.get('Receber', pd.Series(dtype=float)))
+        resumo['saidas_mensais'] = _mensal(por_tipo.get('Pagar', pd.Series(dtype=float)))
+        resumo['saldo_mensal'] = _mensal((df[valor] * sinal).groupby(df['_periodo']).sum())
+    else:
+        resumo['mensal'] = _mensal(df.groupby('_periodo')[valor].sum())
+
+    if 'orcado' in config:
+        orcado = _numero(df[config['orcado']]).fillna(0.0)
+        por_categoria = pd.DataFrame({'orcado': orcado, 'realizado': df[valor], categoria: df[categoria]}) \
+            .groupby(categoria, observed=True).sum()
+        desvio = (por_categoria['realizado'] - por_categoria['orcado']) / por_categoria['orcado'].replace(0, np.nan) * 100
+        resumo['orcado_total'] = _arredondar(orcado.sum())
+        resumo['desvio_total_pct'] = _arredondar((df[valor].sum() - orcado.sum()) / orcado.sum() * 100) \
+            if orcado.sum() else None
+        resumo['maiores_desvios'] = [
+            {'categoria': str(c), 'orcado': _arredondar(por_categoria.at[c, 'orcado']),
+             'realizado': _arredondar(por_categoria.at[c, 'realizado']), 'desvio_pct': _arredondar(desvio[c])}
+            for c in desvio.abs().nlargest(top_k).index
+        ]
+
+    resumo['outliers'] = _outliers(df, valor, categoria, top_k)
+    return resumo
+
+
+def construir_resumo(tipo, registros, top_k=TOP_K, pasta_cache=None, impressao=None):
+    """Resumo estatístico de tamanho limitado para enviar à IA no lugar dos dados brutos.
+
+    O tamanho depende de top_k e da quantidade de meses, não do número de
+    transações. O resultado fica em cache (LRU em memória e, se informado,
+    em 'pasta_cache'), indexado por tipo, top_k e 'impressao'. Passe uma
+    impressão conhecida do dataset (hash do arquivo, número da versão,
+    impressao_arquivo) para que um acerto de cache não precise ler os
+    registros; sem ela, o dataset inteiro é serializado e hasheado. Cada
+    chamada recebe sua própria cópia do resumo.
+    """
+    if tipo not in CONFIG_TIPOS:
+        raise ValueError(f"Tipo de análise desconhecido: {tipo}")
+
+    if impressao is None:
+        digital = impressao_digital(tipo, registros, top_k)
+    else:
+        digital = hashlib.sha1(f'{tipo}\x1f{top_k}\x1f{impressao}'.encode('utf-8')).hexdigest()
+    if digital in _cache:
+        _cache.move_to_end(digital)
+        return copy.deepcopy(_cache[digital])
+
+    arquivo_cache = Path(pasta_cache) / f'{digital}.json' if pasta_cache else None
+    if arquivo_cache and arquivo_cache.exists():
+        with open(arquivo_cache, 'r', encoding='utf-8') as f:
+            resumo = json.load(f)
+    else:
+        resumo = _construir(tipo, registros, top_k)
+        resumo['impressao_digital'] = digital
+        if arquivo_cache:
+            arquivo_cache.parent.mkdir(parents=True, exist_ok=True)
+            gravar_json_atomico(arquivo_cache, resumo)
+
+    _cache[digital] = resumo
+    if len(_cache) > LIMITE_CACHE:
+        _cache.popitem(last=False)
+    return copy.deepcopy(resumo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera o resumo estatístico enviado à análise de IA')
+    parser.add_argument('tipo', choices=sorted(CONFIG_TIPOS), help='Tipo de análise')
+    parser.add_argument('--arquivo', type=Path, help='Dataset JSON (padrão: o arquivo do tipo em dados/)')
+    parser.add_argument('--top', type=int, default=TOP_K, help='Quantidade de itens nos rankings')
+    parser.add_argument('--cache', type=Path, help='Pasta de cache dos resumos')
+    args = parser.parse_args()
+
+    if args.arquivo is None and args.tipo not in ARQUIVOS_TIPOS:
+        parser.error(f"o tipo '{args.tipo}' não tem dataset padrão em dados/; informe --arquivo")
+    arquivo = args.arquivo or DADOS_DIR / ARQUIVOS_TIPOS[args.tipo]
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        registros = json.load(f)
+
+    resumo = construir_resumo(args.tipo, registros, args.top, args.cache, impressao_arquivo(arquivo))
+    print(json.dumps(resumo, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
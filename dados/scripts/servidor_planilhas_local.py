@@ -0,0 +1,165 @@
+import argparse
+import asyncio
+import hashlib
+import sys
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from buscar_planilhas import buscar_planilhas, nome_origem
+
+ATRASO_PADRAO = 0.2
+
+CSV_EXEMPLO = (
+    'Empresa,Mês,Categoria,Subcategoria,Valor\n'
+    'Alpha,1,PESSOAL,Salários,1500.00\n'
+    'Beta,1,ADMINISTRATIVO,Aluguel,800.50\n'
+)
+
+
+class ServidorPlanilhas:
+    """Servidor HTTP local que imita o export CSV do Google Sheets.
+
+    /spreadsheets/d/<id>/export responde 307 para /conteudo/<id> em outro
+    host ('localhost' em vez de '127.0.0.1', como o googleusercontent.com),
+    que entrega o CSV com ETag/Last-Modified e responde 304 a pedidos
+    condicionais. Cada resposta espera 'atraso' segundos, e o servidor
+    registra o pico de requisições simultâneas por host.
+    """
+
+    def __init__(self, planilhas, atraso=ATRASO_PADRAO):
+        self.planilhas = dict(planilhas)
+        self.atraso = atraso
+        self.pico_por_host = {}
+        self.requisicoes = 0
+        self._ativas = {}
+        self._lock = threading.Lock()
+        self._servidor = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._servidor.daemon_threads = True
+        self.porta = self._servidor.server_address[1]
+
+    def url_exportacao(self, planilha, gid=0):
+        return f'http://127.0.0.1:{self.porta}/spreadsheets/d/{planilha}/export?format=csv&gid={gid}'
+
+    def url(self, caminho):
+        return f'http://127.0.0.1:{self.porta}{caminho}'
+
+    def _entrar(self, host):
+        with self._lock:
+            self.requisicoes += 1
+            self._ativas[host] = self._ativas.get(host, 0) + 1
+            self.pico_por_host[host] = max(self.pico_por_host.get(host, 0), self._ativas[host])
+
+    def _sair(self, host):
+        with self._lock:
+            self._ativas[host] -= 1
+
+    def _handler(self):
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _responder(self, status, cabecalhos=None, corpo=b''):
+                self.send_response(status)
+                for nome, valor in (cabecalhos or {}).items():
+                    self.send_header(nome, valor)
+                self.send_header('Content-Length', str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def do_GET(self):
+                host = self.headers.get('Host', '').split(':')[0]
+                servidor._entrar(host)
+                try:
+                    time.sleep(servidor.atraso)
+                    partes = self.path.split('?')[0].strip('/').split('/')
+                    if partes[:2] == ['spreadsheets', 'd'] and len(partes) == 4:
+                        self._responder(307, {'Location': f'http://localhost:{servidor.porta}/conteudo/{partes[2]}'})
+                    elif partes[0] == 'loop':
+                        self._responder(302, {'Location': self.path})
+                    elif partes[0] == 'conteudo' and partes[-1] in servidor.planilhas:
+                        corpo = servidor.planilhas[partes[-1]].encode('utf-8')
+                        etag = '"%s"' % hashlib.sha1(corpo).hexdigest()[:16]
+                        if self.headers.get('If-None-Match') == etag:
+                            self._responder(304, {'ETag': etag})
+                        else:
+                            self._responder(200, {'ETag': etag, 'Last-Modified': formatdate(usegmt=True),
+                                                  'Content-Type': 'text/csv; charset=utf-8'}, corpo)
+                    else:
+                        self._responder(404)
+                finally:
+                    servidor._sair(host)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+
+def verificar(quantidade=12, por_host=6, atraso=ATRASO_PADRAO):
+    """Exercita buscar_planilhas contra o servidor local; devolve a lista de falhas"""
+    falhas = []
+
+    def checar(condicao, descricao):
+        print(f"{'✅' if condicao else '❌'} {descricao}")
+        if not condicao:
+            falhas.append(descricao)
+
+    planilhas = {f'planilha{i}': CSV_EXEMPLO for i in range(quantidade)}
+    with ServidorPlanilhas(planilhas, atraso) as servidor:
+        urls = [servidor.url_exportacao(p) for p in planilhas]
+        cache = {}
+
+        resultados = asyncio.run(buscar_planilhas(urls, cache, por_host=por_host))
+        checar(all(r['status'] == 200 and r['dataset'] == 'despesas' and len(r['registros']) == 2
+                   for r in resultados), 'redirecionamento 307 seguido e CSV convertido em despesas')
+        checar(set(cache) == set(urls), 'validadores guardados pela URL original')
+        checar(max(servidor.pico_por_host.values()) <= por_host,
+               f'no máximo {por_host} requisições simultâneas por host (inclusive nos redirecionamentos)')
+        checar(servidor.pico_por_host.get('localhost') == por_host,
+               f'concorrência chega a {por_host} por host, sem o teto do executor padrão')
+
+        resultados = asyncio.run(buscar_planilhas(urls, cache, por_host=por_host))
+        checar(all(r['status'] == 304 for r in resultados), 'segunda busca volta 304 sem download')
+
+        servidor.planilhas['planilha0'] = CSV_EXEMPLO + 'Gamma,2,PESSOAL,Benefícios,99.90\n'
+        resultados = asyncio.run(buscar_planilhas(urls, cache, por_host=por_host))
+        checar([r['status'] for r in resultados].count(200) == 1 and len(resultados[0]['registros']) == 3,
+               'só a planilha alterada é baixada de novo')
+
+        resultado, = asyncio.run(buscar_planilhas([servidor.url('/loop')], {}, por_host=por_host))
+        checar(resultado['status'] is None and 'redirecionamentos' in resultado['erro'],
+               'laço de redirecionamento vira erro')
+
+        resultado, = asyncio.run(buscar_planilhas([servidor.url('/conteudo/inexistente')], {}))
+        checar(resultado['status'] == 404, 'erro HTTP é reportado com o status')
+
+    checar(nome_origem('http://erp/export?id=1') != nome_origem('http://erp/export?id=2'),
+           'URLs que só diferem na query geram arquivos diferentes')
+    return falhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Verifica o buscador de planilhas contra um servidor HTTP local')
+    parser.add_argument('--quantidade', type=int, default=12, help='Planilhas servidas')
+    parser.add_argument('--por-host', type=int, default=6, help='Requisições simultâneas por host')
+    args = parser.parse_args()
+
+    falhas = verificar(args.quantidade, args.por_host)
+    print()
+    print("✅ Buscador OK" if not falhas else f"❌ {len(falhas)} verificações falharam")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == '__main__':
+    main()
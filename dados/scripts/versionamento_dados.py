@@ -0,0 +1,235 @@
+import argparse
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from mesclar_dados import gravar_json_atomico
+
+INTERVALO_CHECKPOINT = 10
+COMPLETA = 'full'
+TABELA_POSTGRES = 'data_versions_history'
+DELTA = 'delta'
+
+
+def _serializar(registro):
+    return json.dumps(registro, ensure_ascii=False, sort_keys=True, default=str)
+
+
+def chaves_registros(registros):
+    """Chave de cada registro: o 'id' quando todos têm ids únicos, senão o hash do conteúdo.
+
+    Sem id, uma alteração vira remoção + inserção, o que continua correto
+    (só um pouco maior no delta).
+    """
+    ids = [r.get('id') for r in registros]
+    if all(i is not None for i in ids) and len(set(map(str, ids))) == len(ids):
+        return [str(i) for i in ids]
+
+    ocorrencias = {}
+    chaves = []
+    for registro in registros:
+        base = hashlib.sha1(_serializar(registro).encode('utf-8')).hexdigest()[:16]
+        n = ocorrencias.get(base, 0)
+        ocorrencias[base] = n + 1
+        chaves.append(f'{base}_{n}')
+    return chaves
+
+
+def calcular_delta(anterior, atual):
+    """Delta por registro entre duas versões: inseridos, atualizados e removidos (por chave).
+
+    A ordem só é gravada quando não dá para deduzi-la (anteriores sem os
+    removidos, seguidos dos inseridos).
+    """
+    chaves_anteriores = chaves_registros(anterior)
+    chaves_atuais = chaves_registros(atual)
+    indice = {c: _serializar(r) for c, r in zip(chaves_anteriores, anterior)}
+    atuais = set(chaves_atuais)
+
+    delta = {'inseridos': {}, 'atualizados': {}, 'removidos': [c for c in chaves_anteriores if c not in atuais]}
+    for chave, registro in zip(chaves_atuais, atual):
+        serializado = indice.get(chave)
+        if serializado is None:
+            delta['inseridos'][chave] = registro
+        elif serializado != _serializar(registro):
+            delta['atualizados'][chave] = registro
+
+    removidos = set(delta['removidos'])
+    deduzida = [c for c in chaves_anteriores if c not in removidos] + list(delta['inseridos'])
+    if deduzida != chaves_atuais:
+        delta['ordem'] = chaves_atuais
+    return delta
+
+
+def aplicar_delta(registros, delta):
+    """Reconstrói a versão seguinte a partir da anterior e do delta"""
+    removidos = set(delta['removidos'])
+    atualizados = delta['atualizados']
+    por_chave = {}
+    ordem = []
+    for chave, registro in zip(chaves_registros(registros), registros):
+        if chave in removidos:
+            continue
+        por_chave[chave] = atualizados.get(chave, registro)
+        ordem.append(chave)
+    por_chave.update(delta['inseridos'])
+    ordem.extend(delta['inseridos'])
+    return [por_chave[c] for c in delta.get('ordem', ordem)]
+
+
+class ArmazenamentoArquivos:
+    """Versões em arquivos locais: v000001.full.json, v000002.delta.json, ..."""
+
+    PADRAO = re.compile(r'^v(\d+)\.(full|delta)\.json$')
+
+    def __init__(self, pasta):
+        self.pasta = Path(pasta)
+        self.pasta.mkdir(parents=True, exist_ok=True)
+
+    def versoes(self):
+        """{versão: tipo} de tudo que está gravado"""
+        versoes = {}
+        for arquivo in self.pasta.iterdir():
+            encontrado = self.PADRAO.match(arquivo.name)
+            if encontrado:
+                versoes[int(encontrado.group(1))] = encontrado.group(2)
+        return versoes
+
+    def salvar(self, versao, tipo, conteudo, registros):
+        gravar_json_atomico(self.pasta / f'v{versao:06d}.{tipo}.json', conteudo)
+
+    def carregar(self, versao, tipo):
+        with open(self.pasta / f'v{versao:06d}.{tipo}.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+class ArmazenamentoPostgres:
+    """Versões na tabela data_versions_history (ver DATA_VERSIONS_HISTORY_MIGRATION.sql).
+
+    Tabela separada de data_versions, cuja série o googleSheetsSync.ts lê
+    como snapshots completos. Requer psycopg (v3), importado só quando este
+    armazenamento é usado.
+    """
+
+    def __init__(self, dsn, user_id, empresa, file_name, data_type='excel'):
+        try:
+            import psycopg
+            from psycopg.types.json import Jsonb
+        except ImportError as e:
+            raise ImportError("ArmazenamentoPostgres requer o pacote psycopg") from e
+        self._jsonb = Jsonb
+        self._conexao = psycopg.connect(dsn)
+        self._filtro = (user_id, empresa, file_name)
+        self.data_type = data_type
+
+    def versoes(self):
+        with self._conexao.cursor() as cur:
+            cur.execute(
+                f"SELECT version_number, storage_kind FROM {TABELA_POSTGRES} "
+                "WHERE user_id = %s AND empresa = %s AND file_name = %s",
+                self._filtro)
+            return dict(cur.fetchall())
+
+    def salvar(self, versao, tipo, conteudo, registros):
+        texto = json.dumps(conteudo, ensure_ascii=False)
+        with self._conexao.cursor() as cur:
+            cur.execute(
+                f"INSERT INTO {TABELA_POSTGRES} (user_id, empresa, file_name, file_hash, data_type, "
+                "file_size, row_count, version_number, storage_kind, data) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                (*self._filtro, hashlib.sha1(_serializar(registros).encode('utf-8')).hexdigest(),
+                 self.data_type, len(texto), len(registros), versao, tipo, self._jsonb(conteudo)))
+        self._conexao.commit()
+
+    def carregar(self, versao, tipo):
+        with self._conexao.cursor() as cur:
+            cur.execute(
+                f"SELECT data FROM {TABELA_POSTGRES} "
+                "WHERE user_id = %s AND empresa = %s AND file_name = %s AND version_number = %s",
+                (*self._filtro, versao))
+            return cur.fetchone()[0]
+
+
+class HistoricoVersoes:
+    """Histórico com snapshots completos periódicos e deltas entre eles.
+
+    A cada 'intervalo_checkpoint' versões grava-se uma cópia completa; as
+    demais guardam só o delta em relação à anterior. Restaurar uma versão
+    lê o checkpoint mais próximo e reaplica no máximo intervalo - 1 deltas.
+    """
+
+    def __init__(self, armazenamento, intervalo_checkpoint=INTERVALO_CHECKPOINT):
+        if intervalo_checkpoint < 1:
+            raise ValueError("intervalo_checkpoint deve ser >= 1")
+        self.armazenamento = armazenamento
+        self.intervalo_checkpoint = intervalo_checkpoint
+        self._ultima = None
+
+    def salvar(self, registros):
+        """Grava uma nova versão e devolve seu número (None se nada mudou)"""
+        versoes = self.armazenamento.versoes()
+        versao = max(versoes, default=0) + 1
+
+        anterior = None
+        if versoes:
+            if self._ultima is None or self._ultima[0] != versao - 1:
+                self._ultima = (versao - 1, self.restaurar(versao - 1, versoes))
+            anterior = self._ultima[1]
+            if [_serializar(r) for r in anterior] == [_serializar(r) for r in registros]:
+                return None
+
+        desde_checkpoint = 0
+        for v in range(versao - 1, 0, -1):
+            if versoes.get(v) == COMPLETA:
+                break
+            desde_checkpoint += 1
+
+        if anterior is None or desde_checkpoint + 1 >= self.intervalo_checkpoint:
+            self.armazenamento.salvar(versao, COMPLETA, registros, registros)
+        else:
+            self.armazenamento.salvar(versao, DELTA, calcular_delta(anterior, registros), registros)
+        self._ultima = (versao, list(registros))
+        return versao
+
+    def restaurar(self, versao, versoes=None):
+        """Reconstrói uma versão a partir do checkpoint mais próximo"""
+        versoes = self.armazenamento.versoes() if versoes is None else versoes
+        if versao not in versoes:
+            raise KeyError(f"Versão {versao} não encontrada")
+
+        checkpoint = versao
+        while versoes[checkpoint] != COMPLETA:
+            checkpoint -= 1
+        registros = self.armazenamento.carregar(checkpoint, COMPLETA)
+        for v in range(checkpoint + 1, versao + 1):
+            registros = aplicar_delta(registros, self.armazenamento.carregar(v, DELTA))
+        return registros
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Versiona um dataset JSON com snapshots + deltas')
+    sub = parser.add_subparsers(dest='acao', required=True)
+    salvar = sub.add_parser('salvar', help='Grava o arquivo como nova versão')
+    salvar.add_argument('arquivo', type=Path)
+    restaurar = sub.add_parser('restaurar', help='Reconstrói uma versão')
+    restaurar.add_argument('versao', type=int)
+    restaurar.add_argument('saida', type=Path)
+    for p in (salvar, restaurar):
+        p.add_argument('--pasta', type=Path, required=True, help='Pasta do histórico')
+        p.add_argument('--intervalo', type=int, default=INTERVALO_CHECKPOINT,
+                       help='Versões entre snapshots completos')
+    args = parser.parse_args()
+
+    historico = HistoricoVersoes(ArmazenamentoArquivos(args.pasta), args.intervalo)
+    if args.acao == 'salvar':
+        with open(args.arquivo, 'r', encoding='utf-8') as f:
+            versao = historico.salvar(json.load(f))
+        print(f"✅ Versão {versao} gravada" if versao else "⏭️  Sem alterações, nenhuma versão criada")
+    else:
+        gravar_json_atomico(args.saida, historico.restaurar(args.versao))
+        print(f"✅ Versão {args.versao} restaurada em: {args.saida}")
+
+
+if __name__ == '__main__':
+    main()